@@ -0,0 +1,180 @@
+import argparse
+import json
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from bootstrap import intervalos_bootstrap, preparar_amostras
+from cubo_burnout import CuboBurnout
+from dados import carregar_dados, ler_csv_limpo
+from dados_sinteticos import distribuicoes_modelo, gerar_respostas, gravar_partes
+from estatisticas import motor_da_coluna
+from graficos import renderizar_distribuicao
+from modelo_filtros import preparar_base
+from perfil import PerfilExecucao
+
+# Tamanhos padrão (respondentes) e nº de seleções de filtro simuladas por tamanho
+TAMANHOS = [10_000, 100_000, 1_000_000, 5_000_000]
+CONSULTAS = 20
+
+# Regressão: etapa mais lenta (ou com mais memória) que a referência além da tolerância relativa
+# E de um mínimo absoluto (etapas de poucos ms oscilam demais para comparar só pela razão)
+TOLERANCIA = 0.5
+MIN_DIFERENCA_MS = 5.0
+MIN_DIFERENCA_MB = 1.0
+
+COLUNAS_RESULTADO = ['Tamanho', 'Etapa', 'Tempo (ms)', 'ms/Operação', 'Linhas/s', 'Pico Memória (MB)']
+
+
+# --- Seleções como as da barra lateral: 1-3 dimensões e, às vezes, níveis de ensino ---
+def selecoes_aleatorias(modelo, n_consultas, semente=0):
+    rng = np.random.default_rng(semente)
+    dimensoes = list(modelo.categorias)
+    consultas = []
+    for _ in range(n_consultas):
+        escolhidas = rng.choice(len(dimensoes), size=rng.integers(1, 4), replace=False)
+        selecoes = {dimensoes[d]: modelo.categorias[dimensoes[d]][rng.integers(len(modelo.categorias[dimensoes[d]]))]
+                    for d in escolhidas}
+        niveis = [modelo.niveis[rng.integers(len(modelo.niveis))]] if modelo.niveis and rng.random() < 0.3 else []
+        consultas.append((selecoes, niveis))
+    return consultas
+
+
+# --- Uma passada pelo caminho da dashboard (sem Streamlit), com as mesmas etapas do perfil ---
+def executar_pipeline(pasta, n_consultas=CONSULTAS, medir_memoria=False):
+    perfil = PerfilExecucao(medir_memoria=medir_memoria)
+    with perfil.etapa("Carregar dados") as etapa:
+        df = carregar_dados(pasta)
+        etapa['linhas'] = len(df)
+    n = len(df)
+    with perfil.etapa("Faixas de filtro", linhas=n):
+        df, modelo = preparar_base(df)
+    if modelo is None:
+        raise ValueError("Dados sintéticos sem as colunas necessárias para os filtros.")
+    with perfil.etapa("Cubo Nível Burnout", linhas=n):
+        cubo = CuboBurnout(df, modelo)
+    with perfil.etapa("Postos de ET", linhas=n):
+        motor = motor_da_coluna(df['ET'])
+    with perfil.etapa("Amostras bootstrap", linhas=n):
+        amostras = preparar_amostras(df)
+    with perfil.etapa("Opções da barra lateral"):
+        for coluna in modelo.categorias:
+            modelo.opcoes(coluna)
+
+    consultas = selecoes_aleatorias(modelo, n_consultas)
+    with perfil.etapa("Aplicar filtros", linhas=n) as etapa:
+        mascaras = [modelo.mascara(selecoes, niveis=niveis) for selecoes, niveis in consultas]
+        etapa['operacoes'] = len(consultas)
+    with perfil.etapa("Contagens por nível", linhas=n) as etapa:
+        contagens = [tuple(int(c) for c in cubo.distribuicao(selecoes, niveis, mascara=mascara))
+                     for (selecoes, niveis), mascara in zip(consultas, mascaras)]
+        etapa['operacoes'] = len(consultas)
+    # Como na dashboard: medianas do bootstrap só quando o painel de Mann-Whitney aparece
+    comparavel = [0 < motor.tamanho_grupo(m) < motor.n_validos for m in mascaras]
+    with perfil.etapa("Bootstrap (IC)", linhas=n) as etapa:
+        for mascara, medianas in zip(mascaras, comparavel):
+            intervalos_bootstrap(amostras, mascara, medianas=medianas)
+        etapa['operacoes'] = len(mascaras)
+    with perfil.etapa("Mann-Whitney", linhas=motor.n_validos) as etapa:
+        comparaveis = [m for m, ok in zip(mascaras, comparavel) if ok]
+        for mascara in comparaveis:
+            motor.mann_whitney(mascara)
+        etapa['operacoes'] = len(comparaveis)
+    with perfil.etapa("Gráfico") as etapa:
+        for contagem in contagens:
+            renderizar_distribuicao.__wrapped__(contagem)  # sem o LRU: custo real de cada renderização
+        etapa['operacoes'] = len(contagens)
+    return perfil.etapas
+
+
+# --- Benchmark de um tamanho: melhor tempo de N repetições + pico de memória numa passada à parte ---
+# (tracemalloc deixa as alocações mais lentas, então tempo e memória não são medidos juntos)
+def medir_tamanho(n, modelo_dados, repeticoes=1, n_consultas=CONSULTAS, medir_memoria=True, semente=0):
+    with tempfile.TemporaryDirectory(prefix='burnout_bench_') as pasta:
+        gravar_partes(gerar_respostas(n, modelo_dados, semente), pasta)
+        passadas = [executar_pipeline(pasta, n_consultas) for _ in range(repeticoes)]
+        memoria = executar_pipeline(pasta, n_consultas, medir_memoria=True) if medir_memoria else None
+
+    linhas = []
+    for i, etapa in enumerate(passadas[0]):
+        tempo_ms = min(passada[i]['tempo_ms'] for passada in passadas)
+        operacoes = etapa.get('operacoes', 1) or 1
+        processadas = (etapa['linhas'] or 0) * operacoes
+        linhas.append({
+            'Tamanho': n,
+            'Etapa': etapa['etapa'],
+            'Tempo (ms)': tempo_ms,
+            'ms/Operação': tempo_ms / operacoes,
+            'Linhas/s': processadas / (tempo_ms / 1000) if processadas and tempo_ms > 0 else np.nan,
+            'Pico Memória (MB)': memoria[i]['pico_mb'] if memoria else np.nan,
+        })
+    return linhas
+
+
+def executar_benchmark(tamanhos=TAMANHOS, arquivo_modelo='cleaned_data.csv', **opcoes):
+    modelo_dados = distribuicoes_modelo(ler_csv_limpo(arquivo_modelo))
+    return pd.DataFrame([linha for n in tamanhos for linha in medir_tamanho(n, modelo_dados, **opcoes)],
+                        columns=COLUNAS_RESULTADO)
+
+
+# --- Comparação com a referência gravada (JSON: {"tamanho": {"etapa": {"tempo_ms", "pico_mb"}}}) ---
+def para_referencia(resultados):
+    referencia = {}
+    for tamanho, etapa, tempo_ms, pico_mb in zip(resultados['Tamanho'], resultados['Etapa'],
+                                                 resultados['Tempo (ms)'], resultados['Pico Memória (MB)']):
+        referencia.setdefault(str(tamanho), {})[etapa] = {
+            'tempo_ms': float(tempo_ms), 'pico_mb': None if pd.isna(pico_mb) else float(pico_mb),
+        }
+    return referencia
+
+
+def regressoes(resultados, referencia, tolerancia=TOLERANCIA):
+    encontradas = []
+    for tamanho, etapas in para_referencia(resultados).items():
+        for etapa, atual in etapas.items():
+            anterior = referencia.get(tamanho, {}).get(etapa)
+            if anterior is None:
+                continue
+            for metrica, minimo in (('tempo_ms', MIN_DIFERENCA_MS), ('pico_mb', MIN_DIFERENCA_MB)):
+                valor, valor_ref = atual.get(metrica), anterior.get(metrica)
+                if valor is None or valor_ref is None:
+                    continue
+                if valor > valor_ref * (1 + tolerancia) and valor - valor_ref > minimo:
+                    encontradas.append((int(tamanho), etapa, metrica, valor_ref, valor))
+    return pd.DataFrame(encontradas, columns=['Tamanho', 'Etapa', 'Métrica', 'Referência', 'Atual'])
+
+
+# Ex.: python benchmark.py --tamanhos 10000 100000 --referencia benchmark_referencia.json
+#      python benchmark.py --gravar-referencia benchmark_referencia.json
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark do caminho da dashboard (carregar -> faixas -> filtro -> teste -> gráfico) com dados sintéticos.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS)
+    parser.add_argument('--modelo', default='cleaned_data.csv', help="CSV limpo usado como modelo das distribuições")
+    parser.add_argument('--consultas', type=int, default=CONSULTAS, help="Seleções de filtro por tamanho")
+    parser.add_argument('--repeticoes', type=int, default=1, help="Repetições (vale o menor tempo)")
+    parser.add_argument('--sem-memoria', action='store_true', help="Não faz a passada com tracemalloc")
+    parser.add_argument('--referencia', default=None, help="JSON de referência: falha (código 1) em caso de regressão")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA, help="Aumento relativo aceito (0.5 = 50%%)")
+    parser.add_argument('--gravar-referencia', default=None, help="Grava os resultados como nova referência")
+    args = parser.parse_args()
+
+    resultados = executar_benchmark(args.tamanhos, args.modelo, repeticoes=args.repeticoes,
+                                    n_consultas=args.consultas, medir_memoria=not args.sem_memoria)
+    with pd.option_context('display.width', 160, 'display.float_format', '{:,.2f}'.format):
+        print(resultados.to_string(index=False))
+
+    if args.gravar_referencia:
+        with open(args.gravar_referencia, 'w', encoding='utf-8') as f:
+            json.dump(para_referencia(resultados), f, ensure_ascii=False, indent=2)
+        print(f"Referência gravada em '{args.gravar_referencia}'.")
+
+    if args.referencia:
+        with open(args.referencia, encoding='utf-8') as f:
+            encontradas = regressoes(resultados, json.load(f), args.tolerancia)
+        if len(encontradas):
+            print(f"\n{len(encontradas)} regressão(ões) acima de {args.tolerancia:.0%}:")
+            print(encontradas.to_string(index=False))
+            sys.exit(1)
+        print(f"\nSem regressões em relação a '{args.referencia}'.")
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from cubo_burnout import NIVEIS_BURNOUT
+
+
+# --- Vetores por respondente usados no bootstrap (uma vez por versão do dataset) ---
+def preparar_amostras(df):
+    et = pd.to_numeric(df['ET'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    # ET só assume poucos valores (inteiros de 20 a 100): código do valor por respondente (-1 = ausente)
+    valores_et, codigos_et = np.unique(et[~np.isnan(et)], return_inverse=True)
+    codigos = np.full(len(et), -1, dtype=np.int64)
+    codigos[~np.isnan(et)] = codigos_et
+    nivel = df['Nivel_Burnout'].astype(str).to_numpy()
+    # 1 = Nível 4/5, 0 = Nível 1-3, NaN = nível inválido (fora do denominador, como na métrica)
+    risco45 = np.where(np.isin(nivel, NIVEIS_BURNOUT[3:]), 1.0, np.where(np.isin(nivel, NIVEIS_BURNOUT), 0.0, np.nan))
+    for arr in (valores_et, codigos, risco45):
+        arr.flags.writeable = False
+    return {'valores_et': valores_et, 'codigos_et': codigos, 'risco45': risco45}
+
+
+def _medianas_bootstrap(contagens, valores, n_reamostras, rng):
+    # Reamostrar n respondentes com reposição = sortear as contagens de cada valor de ET
+    # (multinomial); a mediana sai das contagens acumuladas. Custo O(B x nº de valores), sem n.
+    n = int(contagens.sum())
+    reamostras = rng.multinomial(n, contagens / n, size=n_reamostras).cumsum(axis=1)
+    inferior = (reamostras > (n - 1) // 2).argmax(axis=1)
+    superior = (reamostras > n // 2).argmax(axis=1)
+    return (valores[inferior] + valores[superior]) / 2
+
+
+# --- IC bootstrap (percentil) do % de risco 4/5 e, opcionalmente, das medianas de ET do grupo e do restante ---
+def intervalos_bootstrap(amostras, mascara, n_reamostras=2000, confianca=0.95, semente=0, medianas=True):
+    mascara = np.asarray(mascara, dtype=bool)
+    risco45, codigos, valores = amostras['risco45'], amostras['codigos_et'], amostras['valores_et']
+    alfa = (1 - confianca) / 2
+    resultados = {'perc45': None, 'mediana_grupo': None, 'mediana_restante': None}
+
+    # % de risco: soma de Bernoullis reamostrada = binomial(n, p)
+    risco_grupo = risco45[mascara & ~np.isnan(risco45)]
+    if len(risco_grupo):
+        rng = np.random.default_rng([semente, 0])
+        distribuicao = rng.binomial(len(risco_grupo), risco_grupo.mean(), size=n_reamostras) / len(risco_grupo) * 100
+        resultados['perc45'] = tuple(float(v) for v in np.quantile(distribuicao, [alfa, 1 - alfa]))
+
+    if medianas:
+        for i, (nome, linhas) in enumerate((('mediana_grupo', mascara), ('mediana_restante', ~mascara)), start=1):
+            selecionados = codigos[linhas]
+            contagens = np.bincount(selecionados[selecionados >= 0], minlength=len(valores))
+            if contagens.sum() == 0:
+                continue
+            distribuicao = _medianas_bootstrap(contagens, valores, n_reamostras, np.random.default_rng([semente, i]))
+            resultados[nome] = tuple(float(v) for v in np.quantile(distribuicao, [alfa, 1 - alfa]))
+    return resultados
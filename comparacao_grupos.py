@@ -0,0 +1,44 @@
+import pandas as pd
+
+from modelo_filtros import LABEL_AUSENTE, ROTULOS_DIMENSOES
+
+# Dimensões ordinais comparadas entre todas as suas faixas (k grupos, não só um contra o restante)
+DIMENSOES_ORDINAIS = [
+    'Faixa_Etaria', 'Faixa_Tempo_Profissao', 'Faixa_Carga_Horaria',
+    'Filtro_Autocuidado', 'Filtro_Lazer', 'Filtro_Apoio_Gestao',
+]
+
+COLUNAS_KRUSKAL = ['Dimensão', 'Grupos', 'N', 'H', 'GL', 'P-valor']
+COLUNAS_DUNN = ['Dimensão', 'Grupo A', 'Grupo B', 'N A', 'N B', 'Posto Médio A', 'Posto Médio B', 'Z', 'P-valor', 'P-ajustado']
+
+
+# --- Kruskal-Wallis + Dunn para todas as dimensões ordinais, dentro do contexto de filtro ---
+# Todos os testes reaproveitam a ordenação global de ET do motor (sem novo sort por dimensão).
+# 'Não Informado' fica de fora: não é uma faixa da escala ordinal.
+def comparar_grupos(modelo, motor, mascara=None, dimensoes=DIMENSOES_ORDINAIS, metodo_correcao='holm'):
+    dentro = motor.na_ordem(mascara) if mascara is not None else None
+    linhas_kruskal, linhas_dunn = [], []
+    for coluna in dimensoes:
+        if coluna not in modelo.codigos:
+            continue
+        categorias = modelo.categorias[coluna]
+        codigos = modelo.codigos[coluna]
+        if LABEL_AUSENTE in categorias:
+            codigos = codigos.copy()
+            codigos[codigos == categorias.index(LABEL_AUSENTE)] = -1
+        resultado = motor.kruskal_dunn(codigos, len(categorias), dentro, metodo_correcao=metodo_correcao)
+        rotulo = ROTULOS_DIMENSOES.get(coluna, coluna)
+
+        linhas_kruskal.append({
+            'Dimensão': rotulo, 'Grupos': resultado['gl'] + 1, 'N': resultado['n'],
+            'H': resultado['H'], 'GL': resultado['gl'], 'P-valor': resultado['p_valor'],
+        })
+        tamanhos, postos_medios = resultado['tamanhos'], resultado['postos_medios']
+        for i, j, z, p_valor, p_ajustado in resultado['pares']:
+            linhas_dunn.append({
+                'Dimensão': rotulo, 'Grupo A': categorias[i], 'Grupo B': categorias[j],
+                'N A': tamanhos[i], 'N B': tamanhos[j],
+                'Posto Médio A': postos_medios[i], 'Posto Médio B': postos_medios[j],
+                'Z': z, 'P-valor': p_valor, 'P-ajustado': p_ajustado,
+            })
+    return pd.DataFrame(linhas_kruskal, columns=COLUNAS_KRUSKAL), pd.DataFrame(linhas_dunn, columns=COLUNAS_DUNN)
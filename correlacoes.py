@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+# Itens do questionário de burnout (Q9 entra invertido como Q9_inv) e variáveis de carga/demanda
+ITENS_BURNOUT = [f'Q{i}' for i in range(1, 21)] + ['Q9_inv']
+VARIAVEIS_CARGA = {
+    'b3_5_carga_horaria': "Carga Horária",
+    'b3_6_num_instituicoes': "Nº Instituições",
+    'b3_8_outras_atividades': "Outras Atividades",
+    'b3_9_carga_administrativa': "Carga Administrativa",
+    'b4_1_desligar_trabalho': "Desligar do Trabalho",
+    'b4_5_intencao_abandonar_profissao': "Intenção de Abandonar",
+    'b4_6_demanda_pais': "Demanda dos Pais",
+}
+
+
+def _numerico(serie):
+    # Respostas como '4 ou mais.' viram 4; texto sem número vira NaN
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float)
+    return pd.to_numeric(serie.astype(str).str.extract(r'(-?\d+(?:[.,]\d+)?)', expand=False).str.replace(',', '.'), errors='coerce')
+
+
+# --- Matrizes numéricas (itens x variáveis), montadas uma vez por versão do dataset ---
+def preparar_variaveis(df, itens=ITENS_BURNOUT, variaveis=VARIAVEIS_CARGA):
+    itens = [c for c in itens if c in df.columns]
+    variaveis = {c: rotulo for c, rotulo in variaveis.items() if c in df.columns}
+    x = np.column_stack([_numerico(df[c]).to_numpy(dtype=float, na_value=np.nan) for c in itens]) if itens else np.empty((len(df), 0))
+    y = np.column_stack([_numerico(df[c]).to_numpy(dtype=float, na_value=np.nan) for c in variaveis]) if variaveis else np.empty((len(df), 0))
+    for arr in (x, y):
+        arr.flags.writeable = False
+    return {'x': x, 'y': y, 'itens': itens, 'variaveis': list(variaveis.values())}
+
+
+def _media_validos(valores, validos):
+    return np.where(validos, valores, 0.0).sum(axis=0) / np.maximum(validos.sum(axis=0), 1)
+
+
+def _pearson_pares_completos(x, y):
+    # r de Pearson de cada coluna de x com cada coluna de y usando, por par, só as linhas
+    # em que os dois valores existem; tudo por produtos de matrizes (sem laço por par)
+    validos_x, validos_y = ~np.isnan(x), ~np.isnan(y)
+    # Centraliza pela média global da coluna para reduzir cancelamento numérico
+    x0 = np.where(validos_x, x - _media_validos(x, validos_x), 0.0)
+    y0 = np.where(validos_y, y - _media_validos(y, validos_y), 0.0)
+    mx, my = validos_x.astype(float), validos_y.astype(float)
+
+    n = mx.T @ my
+    soma_x, soma_y = x0.T @ my, mx.T @ y0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = x0.T @ y0 - soma_x * soma_y / n
+        var_x = (x0 ** 2).T @ my - soma_x ** 2 / n
+        var_y = mx.T @ (y0 ** 2) - soma_y ** 2 / n
+        r = cov / np.sqrt(var_x * var_y)
+    r[(var_x <= 0) | (var_y <= 0)] = np.nan
+    return np.clip(r, -1.0, 1.0), n.astype(np.int64)
+
+
+def _spearman_pares_completos(x, y):
+    # Postos recalculados no conjunto de linhas completas de cada par. Colunas de x com o
+    # mesmo padrão de ausência (dentro das linhas válidas de y) são ranqueadas juntas.
+    r = np.full((x.shape[1], y.shape[1]), np.nan)
+    n = np.zeros((x.shape[1], y.shape[1]), dtype=np.int64)
+    validos_x = ~np.isnan(x)
+    for j in range(y.shape[1]):
+        linhas_y = ~np.isnan(y[:, j])
+        padroes = {}
+        for i in range(x.shape[1]):
+            padroes.setdefault(np.packbits(validos_x[linhas_y, i]).tobytes(), []).append(i)
+        for colunas in padroes.values():
+            linhas = linhas_y & validos_x[:, colunas[0]]
+            if linhas.sum() < 2:
+                continue
+            postos_x = stats.rankdata(x[np.ix_(linhas, colunas)], axis=0)
+            postos_y = stats.rankdata(y[linhas, j])
+            r_bloco, n_bloco = _pearson_pares_completos(postos_x, postos_y[:, None])
+            r[colunas, j], n[colunas, j] = r_bloco[:, 0], n_bloco[:, 0]
+    return r, n
+
+
+# --- Matriz de correlação (Pearson e Spearman) com p-valores e intervalos de confiança ---
+def matriz_correlacoes(variaveis, mascara=None, confianca=0.95):
+    x, y = variaveis['x'], variaveis['y']
+    if mascara is not None:
+        x, y = x[mascara], y[mascara]
+    z_critico = special.ndtri(0.5 + confianca / 2)
+
+    def quadro(valores):
+        return pd.DataFrame(valores, index=variaveis['itens'], columns=variaveis['variaveis'])
+
+    resultados = {}
+    for metodo, calcular in (('Pearson', _pearson_pares_completos), ('Spearman', _spearman_pares_completos)):
+        r, n = calcular(x, y)
+        gl = n - 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = r * np.sqrt(gl / ((1 - r) * (1 + r)))
+            p_valor = np.where(gl > 0, 2 * stats.t.sf(np.abs(t), np.maximum(gl, 1)), np.nan)
+            # IC pela transformação z de Fisher (Spearman: erro-padrão de Bonett-Wright)
+            erro = 1 / np.sqrt(n - 3) if metodo == 'Pearson' else np.sqrt((1 + r ** 2 / 2) / (n - 3))
+            z = np.arctanh(r)
+            ic_inf, ic_sup = np.tanh(z - z_critico * erro), np.tanh(z + z_critico * erro)
+        ic_inf[n <= 3], ic_sup[n <= 3] = np.nan, np.nan
+        resultados[metodo] = {'r': quadro(r), 'p_valor': quadro(p_valor), 'ic_inf': quadro(ic_inf),
+                              'ic_sup': quadro(ic_sup), 'n': quadro(n)}
+    return resultados
+
+
+def tabela_correlacoes(resultado):
+    # Formato longo (uma linha por par item x variável), ordenado pela força da correlação
+    partes = {nome: quadro.stack() for nome, quadro in resultado.items()}
+    tabela = pd.DataFrame(partes).reset_index()
+    tabela.columns = ['Item', 'Variável', 'r', 'P-valor', 'IC Inf', 'IC Sup', 'N']
+    return tabela.reindex(tabela['r'].abs().sort_values(ascending=False, na_position='last').index).reset_index(drop=True)
@@ -0,0 +1,133 @@
+import argparse
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from dados import carregar_dados
+from modelo_filtros import preparar_base
+
+NIVEIS_BURNOUT = ['Nível 1', 'Nível 2', 'Nível 3', 'Nível 4', 'Nível 5']
+
+
+# Células (opções x níveis de burnout) acima das quais um roll-up não é materializado
+LIMITE_CELULAS_ROLLUP = 1 << 22
+# Memória total dos roll-ups memorizados (o cubo é compartilhado por todas as sessões)
+LIMITE_BYTES_ROLLUPS = 256 << 20
+
+
+# --- Cubo de contagens de Nivel_Burnout, materializado por conjunto de dimensões ---
+# Cada consulta usa um roll-up só das dimensões selecionadas (+ os níveis de ensino exigidos):
+# um bincount O(n) na primeira vez, memorizado pelo conjunto; as demais opções das mesmas
+# dimensões viram uma leitura O(1). Roll-ups com mais células que linhas (ou acima do limite)
+# não compensam e caem no bincount da máscara.
+class CuboBurnout:
+    def __init__(self, df, modelo, max_bytes=LIMITE_BYTES_ROLLUPS):
+        self.dimensoes = list(modelo.codigos)
+        self.niveis = list(modelo.niveis)
+        self._modelo = modelo
+
+        nivel = np.full(len(df), -1, dtype=np.int8)
+        valores_nivel = df['Nivel_Burnout'].astype(str).to_numpy()
+        for i, rotulo in enumerate(NIVEIS_BURNOUT):
+            nivel[valores_nivel == rotulo] = i
+        nivel.flags.writeable = False
+        self.nivel = nivel
+
+        self._max_bytes = max_bytes
+        self._bytes_rollups = 0
+        self._rollups = OrderedDict()
+        self._trava = threading.Lock()  # o LRU é alterado por várias sessões (threads) ao mesmo tempo
+
+    @property
+    def n_rollups(self):
+        return len(self._rollups)
+
+    def _contagens_mascara(self, mascara):
+        nivel = self.nivel[mascara]
+        return np.bincount(nivel[nivel >= 0], minlength=len(NIVEIS_BURNOUT))
+
+    def _rollup(self, dimensoes, niveis):
+        # Matriz (opções da dim. 1 x ... x [atua nos níveis: não/sim] x níveis de burnout)
+        chave = (dimensoes, niveis)
+        with self._trava:
+            contagens = self._rollups.get(chave)
+            if contagens is not None:
+                self._rollups.move_to_end(chave)
+                return contagens
+        bases = [len(self._modelo.categorias[d]) for d in dimensoes] + ([2] if niveis else [])
+        if np.prod([float(b) for b in bases]) * len(NIVEIS_BURNOUT) > min(LIMITE_CELULAS_ROLLUP, len(self.nivel)):
+            return None
+
+        validos = self.nivel >= 0
+        for d in dimensoes:
+            validos &= self._modelo.codigos[d] >= 0
+        celula = np.zeros(int(validos.sum()), dtype=np.int64)
+        for d in dimensoes:
+            celula = celula * len(self._modelo.categorias[d]) + self._modelo.codigos[d][validos]
+        if niveis:
+            celula = celula * 2 + self._modelo.mascara({}, niveis=niveis)[validos]
+        contagens = np.bincount(celula * len(NIVEIS_BURNOUT) + self.nivel[validos],
+                                minlength=int(np.prod(bases, dtype=np.int64)) * len(NIVEIS_BURNOUT))
+        contagens = contagens.reshape(bases + [len(NIVEIS_BURNOUT)])
+        contagens.flags.writeable = False
+        with self._trava:
+            if chave not in self._rollups:  # outra sessão pode ter montado o mesmo roll-up em paralelo
+                self._rollups[chave] = contagens
+                self._bytes_rollups += contagens.nbytes
+            while self._bytes_rollups > self._max_bytes and len(self._rollups) > 1:
+                self._bytes_rollups -= self._rollups.popitem(last=False)[1].nbytes
+        return contagens
+
+    def distribuicao(self, selecoes=None, niveis=(), mascara=None):
+        # Retorna as contagens dos Níveis 1-5 (np.ndarray de 5 inteiros) para o filtro
+        # (mascara: a do mesmo filtro, se já calculada, reaproveitada quando não há roll-up)
+        selecoes = selecoes or {}
+        if any(opcao not in self._modelo.categorias[coluna] for coluna, opcao in selecoes.items()) \
+                or any(nivel not in self.niveis for nivel in niveis):
+            return np.zeros(len(NIVEIS_BURNOUT), dtype=np.int64)
+        dimensoes = tuple(sorted(selecoes))
+        niveis = tuple(sorted(set(niveis)))
+        rollup = self._rollup(dimensoes, niveis)
+        if rollup is None:
+            if mascara is None:
+                mascara = self._modelo.mascara(selecoes, niveis=niveis)
+            return self._contagens_mascara(mascara)
+        posicao = tuple(self._modelo.categorias[d].index(selecoes[d]) for d in dimensoes) + ((1,) if niveis else ())
+        return rollup[posicao]
+
+    def consultar(self, selecoes=None, niveis=()):
+        # Resumo serializável em JSON (para outras ferramentas)
+        contagens = self.distribuicao(selecoes, niveis)
+        total = int(contagens.sum())
+        risco45 = int(contagens[3] + contagens[4])
+        return {
+            'filtros': dict(selecoes or {}),
+            'niveis_ensino': list(niveis),
+            'n_validos': total,
+            'contagens': {rotulo: int(c) for rotulo, c in zip(NIVEIS_BURNOUT, contagens)},
+            'risco_alto_critico': risco45,
+            'perc_risco_alto_critico': (risco45 / total) * 100 if total > 0 else 0.0,
+        }
+
+
+def construir_cubo(filepath='cleaned_data.csv'):
+    df, modelo = preparar_base(carregar_dados(filepath))
+    if modelo is None:
+        raise ValueError(f"'{filepath}' não tem as colunas necessárias para os filtros.")
+    return CuboBurnout(df, modelo)
+
+
+# --- Consulta via linha de comando: imprime o resumo em JSON ---
+# Ex.: python cubo_burnout.py --filtro "Faixa_Etaria=31-40 anos" --nivel "Ensino Médio"
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Consulta o cubo de Nivel_Burnout e imprime JSON.")
+    parser.add_argument('--arquivo', default='cleaned_data.csv')
+    parser.add_argument('--filtro', action='append', default=[], help="COLUNA=OPÇÃO (pode repetir)")
+    parser.add_argument('--nivel', action='append', default=[], help="Nível de ensino (pode repetir)")
+    args = parser.parse_args()
+
+    selecoes = dict(filtro.split('=', 1) for filtro in args.filtro)
+    cubo = construir_cubo(args.arquivo)
+    print(json.dumps(cubo.consultar(selecoes, args.nivel), ensure_ascii=False, indent=2))
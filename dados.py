@@ -0,0 +1,128 @@
+import glob
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:  # pyarrow é opcional: sem ele, o CSV é lido diretamente a cada carga
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+PASTA_CACHE = '.cache_dados'
+
+
+# --- Leitura do CSV limpo (formato exportado pela Célula 2) ---
+def ler_csv_limpo(filepath):
+    return pd.read_csv(filepath, encoding='utf-8-sig', sep=';')
+
+
+# --- Versão do arquivo (muda quando o CSV é regravado) ---
+# Para uma pasta de partes Arrow (saída de pontuacao.py): tamanho total e mtime mais recente
+def versao_arquivo(filepath):
+    if os.path.isdir(filepath):
+        stats = [os.stat(parte) for parte in _partes_arrow(filepath)]
+        if not stats:
+            raise FileNotFoundError(filepath)
+        return (filepath, sum(s.st_size for s in stats), max(s.st_mtime_ns for s in stats))
+    stat = os.stat(filepath)
+    return (filepath, stat.st_size, stat.st_mtime_ns)
+
+
+def _partes_arrow(pasta):
+    return sorted(glob.glob(os.path.join(pasta, 'parte-*.arrow')))
+
+
+# --- Pasta de partes Arrow já pontuadas: cada parte é mapeada em memória e concatenada ---
+def ler_partes(pasta):
+    partes = _partes_arrow(pasta)
+    if not partes:
+        raise FileNotFoundError(pasta)
+    tabela = pa.concat_tables([feather.read_table(parte, memory_map=True) for parte in partes])
+    return tabela.to_pandas(split_blocks=True)
+
+
+def hash_arquivo(filepath, tamanho_bloco=1 << 20):
+    sha = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def caminho_cache(filepath):
+    pasta = os.path.join(os.path.dirname(os.path.abspath(filepath)), PASTA_CACHE)
+    return os.path.join(pasta, os.path.basename(filepath) + '.arrow')
+
+
+def _ler_metadados(caminho_meta):
+    try:
+        with open(caminho_meta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _gravar_atomico(caminho, escrever):
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    escrever(temporario)
+    os.replace(temporario, caminho)
+
+
+def _cache_valido(filepath, caminho_meta, caminho_arrow):
+    # Tamanho + mtime iguais: válido sem ler o CSV. Só o mtime mudou: confirma pelo hash do conteúdo.
+    meta = _ler_metadados(caminho_meta)
+    if meta is None or not os.path.exists(caminho_arrow):
+        return False
+    _, tamanho, mtime = versao_arquivo(filepath)
+    if meta.get('tamanho') != tamanho:
+        return False
+    if meta.get('mtime_ns') == mtime:
+        return True
+    if meta.get('sha256') != hash_arquivo(filepath):
+        return False
+    meta['mtime_ns'] = mtime
+    _gravar_atomico(caminho_meta, lambda tmp: _escrever_json(tmp, meta))
+    return True
+
+
+def _escrever_json(caminho, dados):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(dados, f)
+
+
+# --- Cache colunar (Arrow IPC sem compressão, lido via memory-map) ---
+def reconstruir_cache(filepath):
+    caminho_arrow = caminho_cache(filepath)
+    os.makedirs(os.path.dirname(caminho_arrow), exist_ok=True)
+    _, tamanho, mtime = versao_arquivo(filepath)
+    sha256 = hash_arquivo(filepath)
+    df = ler_csv_limpo(filepath)
+    _gravar_atomico(caminho_arrow, lambda tmp: feather.write_feather(df, tmp, compression='uncompressed'))
+    meta = {'tamanho': tamanho, 'mtime_ns': mtime, 'sha256': sha256}
+    _gravar_atomico(caminho_arrow + '.json', lambda tmp: _escrever_json(tmp, meta))
+    return df
+
+
+def carregar_dados(filepath='cleaned_data.csv'):
+    # Lança FileNotFoundError se o CSV não existir (tratado pela dashboard)
+    if os.path.isdir(filepath):
+        if feather is None:
+            raise ImportError("pyarrow é necessário para ler a pasta de partes Arrow.")
+        return ler_partes(filepath)
+    if feather is None:
+        return ler_csv_limpo(filepath)
+    caminho_arrow = caminho_cache(filepath)
+    try:
+        if not _cache_valido(filepath, caminho_arrow + '.json', caminho_arrow):
+            reconstruir_cache(filepath)
+        # split_blocks: colunas numéricas sem nulos viram views (somente leitura) do arquivo mapeado
+        return feather.read_table(caminho_arrow, memory_map=True).to_pandas(split_blocks=True)
+    except FileNotFoundError:
+        raise
+    except Exception:
+        # Cache corrompido ou sem permissão de escrita: volta para o CSV
+        return ler_csv_limpo(filepath)
@@ -0,0 +1,160 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import special
+
+from dados import ler_csv_limpo
+from modelo_filtros import COLUNA_NIVEIS, NIVEIS_IGNORADOS
+from pontuacao import COLUNAS_DERIVADAS, COLUNAS_ITENS, COLUNAS_TEXTO, pontuar_bloco
+
+try:  # pyarrow é necessário só para gravar a pasta de partes Arrow
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# Variáveis contínuas: valores interpolados entre os observados (as demais repetem os valores observados)
+COLUNAS_CONTINUAS = ['b1_1_idade', 'b3_2_tempo_profissao', 'b3_5_carga_horaria']
+
+# Carga de cada coluna no fator latente comum (exaustão / demanda): correlaciona os itens
+# entre si e com as variáveis de carga de trabalho. Q9 é invertido no questionário.
+CARGAS_LATENTES = {
+    **{coluna: 0.72 for coluna in COLUNAS_ITENS},
+    'Q9': -0.72,
+    'b3_5_carga_horaria': 0.25,
+    'b3_9_carga_administrativa': 0.3,
+    'b4_1_desligar_trabalho': 0.3,
+    'b4_5_intencao_abandonar_profissao': 0.4,
+    'b4_6_demanda_pais': 0.25,
+    'b4_2_apoio_institucional_saude_mental': -0.2,
+    'b4_7_apoio_gestao_escolar': -0.25,
+    'b2_2_frequencia_autocuidado': -0.2,
+    'b2_3_tempo_energia_lazer': -0.3,
+}
+
+TAXA_AUSENCIA = 0.02         # respostas em branco somadas às já observadas no modelo (sorteio independente)
+TAXA_ITENS_INCOMPLETOS = 0.005  # questionários com um item Q1-Q20 em branco (ET inválido)
+
+
+# --- Distribuições marginais do CSV limpo (o "modelo" da pesquisa real) ---
+def distribuicoes_modelo(df):
+    colunas = [c for c in df.columns if c not in COLUNAS_DERIVADAS]
+    modelo = {'colunas': colunas, 'ausencia': {}, 'numericas': {}, 'texto': {}}
+    for coluna in colunas:
+        serie = df[coluna]
+        modelo['ausencia'][coluna] = float(serie.isna().mean())
+        if coluna == COLUNA_NIVEIS:
+            continue
+        validos = serie.dropna()
+        if coluna in COLUNAS_TEXTO or not pd.api.types.is_numeric_dtype(serie):
+            frequencias = validos.astype(str).value_counts(normalize=True)
+            modelo['texto'][coluna] = (frequencias.index.to_numpy(dtype=object), frequencias.to_numpy())
+        else:
+            modelo['numericas'][coluna] = np.sort(validos.to_numpy(dtype=float))
+
+    # Níveis de ensino: taxa de atuação em cada nível (um respondente pode atuar em vários)
+    partes = df[COLUNA_NIVEIS].dropna().astype(str).str.split(';')
+    niveis = partes.explode().str.strip()
+    niveis = niveis[(niveis != '') & ~niveis.str.lower().isin(NIVEIS_IGNORADOS)]
+    modelo['niveis'] = sorted(niveis.unique())
+    modelo['taxas_niveis'] = np.array([(niveis == nivel).groupby(level=0).any().sum() / max(len(partes), 1)
+                                       for nivel in modelo['niveis']])
+    return modelo
+
+
+def _niveis_ensino(modelo, rng, n):
+    # Cada combinação de níveis é um conjunto de bits; o texto ('A; B') é montado uma vez por combinação
+    niveis, taxas = modelo['niveis'], modelo['taxas_niveis']
+    if not niveis:
+        return np.full(n, np.nan, dtype=object)
+    atua = rng.random((n, len(niveis))) < taxas
+    nenhum = ~atua.any(axis=1)
+    atua[nenhum, rng.choice(len(niveis), size=int(nenhum.sum()), p=taxas / taxas.sum())] = True
+    combinacao = atua.astype(np.int64) @ np.left_shift(1, np.arange(len(niveis), dtype=np.int64))
+    textos = np.array(['; '.join(nivel for j, nivel in enumerate(niveis) if bits >> j & 1)
+                       for bits in range(1 << len(niveis))], dtype=object)
+    return textos[combinacao]
+
+
+# --- Um bloco de respostas brutas + colunas derivadas (ET, Nivel_Burnout...) pela pontuação oficial ---
+def gerar_bloco(modelo, n, semente, taxa_ausencia=TAXA_AUSENCIA, taxa_itens_incompletos=TAXA_ITENS_INCOMPLETOS):
+    rng = np.random.default_rng(semente)
+    latente = rng.standard_normal(n)
+    colunas = {}
+    for coluna in modelo['colunas']:
+        if coluna == COLUNA_NIVEIS:
+            valores = _niveis_ensino(modelo, rng, n)
+        elif coluna in modelo['texto']:
+            opcoes, probabilidades = modelo['texto'][coluna]
+            valores = opcoes[rng.choice(len(opcoes), size=n, p=probabilidades)] if len(opcoes) else np.full(n, np.nan, dtype=object)
+        else:
+            observados = modelo['numericas'][coluna]
+            if len(observados) == 0:
+                colunas[coluna] = np.full(n, np.nan)
+                continue
+            # Cópula gaussiana: quantis da distribuição observada, correlacionados pelo fator latente
+            carga = CARGAS_LATENTES.get(coluna, 0.0)
+            z = carga * latente + np.sqrt(1 - carga ** 2) * rng.standard_normal(n)
+            if coluna in COLUNAS_CONTINUAS:
+                valores = np.round(np.quantile(observados, special.ndtr(z), method='linear'))
+            else:
+                valores = np.quantile(observados, special.ndtr(z), method='inverted_cdf')
+
+        # Itens em branco só nos questionários incompletos; demais colunas com a ausência observada
+        # mais a extra (sorteios independentes: observada + extra x respostas ainda preenchidas)
+        observada = modelo['ausencia'][coluna]
+        taxa = observada if coluna in COLUNAS_ITENS else observada + taxa_ausencia * (1 - observada)
+        ausentes = rng.random(n) < taxa
+        if ausentes.any():
+            valores = np.where(ausentes, np.nan, valores) if valores.dtype != object else np.where(ausentes, None, valores)
+        colunas[coluna] = valores
+
+    incompletos = np.flatnonzero(rng.random(n) < taxa_itens_incompletos)
+    item_em_branco = rng.integers(0, len(COLUNAS_ITENS), size=len(incompletos))
+    for j, coluna in enumerate(COLUNAS_ITENS):
+        if coluna in colunas:
+            colunas[coluna][incompletos[item_em_branco == j]] = np.nan
+    return pontuar_bloco(pd.DataFrame(colunas))
+
+
+# --- Respostas sintéticas em blocos (memória limitada; mesmo resultado para a mesma semente) ---
+def gerar_respostas(n, modelo, semente=0, tamanho_bloco=500_000, **taxas):
+    tamanhos = [min(tamanho_bloco, n - i) for i in range(0, n, tamanho_bloco)]
+    for tamanho, semente_bloco in zip(tamanhos, np.random.SeedSequence(semente).spawn(len(tamanhos))):
+        yield gerar_bloco(modelo, tamanho, semente_bloco, **taxas)
+
+
+# Mesma pasta de partes Arrow que pontuacao.py grava (lida por dados.carregar_dados)
+def gravar_partes(blocos, destino):
+    if feather is None:
+        raise ImportError("pyarrow é necessário para gravar a saída colunar.")
+    os.makedirs(destino, exist_ok=True)
+    total = 0
+    for i, bloco in enumerate(blocos):
+        feather.write_feather(bloco, os.path.join(destino, f"parte-{i:05d}.arrow"), compression='uncompressed')
+        total += len(bloco)
+    return total
+
+
+# Ex.: python dados_sinteticos.py 1000000 --destino sintetico_1m   (ou --csv sintetico.csv)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera respostas sintéticas com o esquema (e as distribuições) do CSV limpo.")
+    parser.add_argument('n', type=int, help="Número de respondentes")
+    parser.add_argument('--modelo', default='cleaned_data.csv', help="CSV limpo usado como modelo das distribuições")
+    parser.add_argument('--destino', default=None, help="Pasta de partes Arrow")
+    parser.add_argument('--csv', default=None, help="CSV no formato da Célula 2")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--ausencia', type=float, default=TAXA_AUSENCIA, help="Taxa extra de respostas em branco")
+    args = parser.parse_args()
+    if not args.destino and not args.csv:
+        parser.error("informe --destino e/ou --csv")
+
+    modelo = distribuicoes_modelo(ler_csv_limpo(args.modelo))
+    blocos = gerar_respostas(args.n, modelo, args.semente, taxa_ausencia=args.ausencia)
+    if args.csv:
+        blocos = list(blocos)
+        pd.concat(blocos, ignore_index=True).to_csv(args.csv, sep=';', index=False, encoding='utf-8-sig')
+    if args.destino:
+        gravar_partes(blocos, args.destino)
+    print(f"{args.n} respostas sintéticas -> {args.destino or args.csv}")
@@ -0,0 +1,195 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+from scipy.stats import mannwhitneyu
+
+ResultadoMannWhitney = namedtuple(
+    'ResultadoMannWhitney', ['estatistica', 'p_valor', 'mediana_grupo', 'mediana_restante', 'n_grupo', 'n_restante'])
+
+
+def motor_da_coluna(serie):
+    return MotorPostos(pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float, na_value=np.nan))
+
+
+# --- Correção para comparações múltiplas ---
+def ajustar_p_valores(p_valores, metodo='fdr_bh'):
+    # 'fdr_bh' (Benjamini-Hochberg) ou 'holm'; valores NaN são ignorados e preservados
+    p = np.asarray(p_valores, dtype=float)
+    ajustados = np.full(p.shape, np.nan)
+    validos = np.flatnonzero(~np.isnan(p))
+    m = len(validos)
+    if m == 0:
+        return ajustados
+    ordem = validos[np.argsort(p[validos], kind='stable')]
+    p_ordenados = p[ordem]
+    if metodo == 'fdr_bh':
+        fatores = m / np.arange(1, m + 1)
+        corrigidos = np.minimum.accumulate((p_ordenados * fatores)[::-1])[::-1]
+    elif metodo == 'holm':
+        fatores = m - np.arange(m)
+        corrigidos = np.maximum.accumulate(p_ordenados * fatores)
+    else:
+        raise ValueError(f"Método de correção desconhecido: {metodo}")
+    ajustados[ordem] = np.clip(corrigidos, 0.0, 1.0)
+    return ajustados
+
+
+def _mediana_ordenada(valores_ordenados):
+    n = len(valores_ordenados)
+    if n == 0:
+        return np.nan
+    meio = n // 2
+    if n % 2:
+        return float(valores_ordenados[meio])
+    return (float(valores_ordenados[meio - 1]) + float(valores_ordenados[meio])) / 2
+
+
+# --- Postos globais de uma variável (ex.: ET), calculados uma vez por versão do dataset ---
+# Qualquer subconjunto (máscara) é comparado com o restante usando somas de postos e
+# estatísticas de ordem, sem reordenar os dados nem materializar o DataFrame complementar.
+class MotorPostos:
+    def __init__(self, valores):
+        valores = np.asarray(valores, dtype=float)
+        self.n_linhas = len(valores)
+        indices_validos = np.flatnonzero(~np.isnan(valores))
+        self.ordem = indices_validos[np.argsort(valores[indices_validos], kind='stable')]
+        self.valores_ordenados = valores[self.ordem]
+        self.n_validos = len(self.ordem)
+
+        # Grupos de empates na ordem crescente -> posto médio (1-based) e termo de correção sum(t^3 - t)
+        inicio_grupo = np.r_[True, self.valores_ordenados[1:] != self.valores_ordenados[:-1]] if self.n_validos else np.zeros(0, dtype=bool)
+        self.grupo_ordenado = np.cumsum(inicio_grupo) - 1
+        self.tamanhos_grupos = np.bincount(self.grupo_ordenado) if self.n_validos else np.zeros(0, dtype=np.int64)
+        self.inicios_grupos = np.flatnonzero(inicio_grupo)
+        postos_grupo = self.inicios_grupos + (self.tamanhos_grupos + 1) / 2
+        self.postos_ordenados = postos_grupo[self.grupo_ordenado]
+        t = self.tamanhos_grupos.astype(float)
+        self.termo_empates = float(np.sum(t ** 3 - t))
+        self.ha_empates = bool(np.any(self.tamanhos_grupos > 1))
+
+        for arr in (self.ordem, self.valores_ordenados, self.grupo_ordenado, self.tamanhos_grupos,
+                    self.inicios_grupos, self.postos_ordenados):
+            arr.flags.writeable = False
+
+    def na_ordem(self, mascara):
+        # Máscara por linha do DataFrame -> máscara na ordem crescente dos valores válidos
+        return np.asarray(mascara, dtype=bool)[self.ordem]
+
+    def tamanho_grupo(self, mascara):
+        return int(np.count_nonzero(self.na_ordem(mascara)))
+
+    def mann_whitney(self, mascara):
+        # Teste bilateral do grupo (mascara) contra o restante, equivalente a
+        # scipy.stats.mannwhitneyu(grupo, restante, alternative='two-sided')
+        dentro = self.na_ordem(mascara)
+        n1 = int(np.count_nonzero(dentro))
+        n2 = self.n_validos - n1
+        if n1 == 0 or n2 == 0:
+            raise ValueError("Grupo filtrado ou restante sem valores válidos.")
+        grupo = self.valores_ordenados[dentro]
+        restante = self.valores_ordenados[~dentro]
+        mediana_grupo, mediana_restante = _mediana_ordenada(grupo), _mediana_ordenada(restante)
+
+        if not self.ha_empates and min(n1, n2) <= 8:
+            # Mesmo critério do method='auto' do scipy: amostra pequena e sem empates -> p exato
+            estatistica, p_valor = mannwhitneyu(grupo, restante, alternative='two-sided')
+            return ResultadoMannWhitney(float(estatistica), float(p_valor), mediana_grupo, mediana_restante, n1, n2)
+
+        u1 = float(self.postos_ordenados[dentro].sum()) - n1 * (n1 + 1) / 2
+        u = max(u1, n1 * n2 - u1)
+        n = n1 + n2
+        variancia = n1 * n2 / 12 * ((n + 1) - self.termo_empates / (n * (n - 1)))
+        if variancia <= 0:
+            raise ValueError("Sem variação nos valores comparados.")
+        z = (u - n1 * n2 / 2 - 0.5) / np.sqrt(variancia)
+        p_valor = float(np.clip(2 * special.ndtr(-z), 0.0, 1.0))
+        return ResultadoMannWhitney(u1, p_valor, mediana_grupo, mediana_restante, n1, n2)
+
+    def mann_whitney_lote(self, dentro):
+        # Vários grupos de uma vez: dentro é (n_grupos, n_validos) booleano na ordem crescente.
+        # Retorna arrays (u1, p_valor, mediana_grupo, mediana_restante, n_grupo, n_restante).
+        dentro = np.asarray(dentro, dtype=bool)
+        n1 = dentro.sum(axis=1).astype(float)
+        n2 = self.n_validos - n1
+        u1 = dentro.astype(float) @ self.postos_ordenados - n1 * (n1 + 1) / 2
+
+        n = float(self.n_validos)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variancia = n1 * n2 / 12 * ((n + 1) - self.termo_empates / (n * (n - 1)))
+            u = np.maximum(u1, n1 * n2 - u1)
+            z = (u - n1 * n2 / 2 - 0.5) / np.sqrt(variancia)
+            p_valor = np.clip(2 * special.ndtr(-z), 0.0, 1.0)
+        p_valor[(n1 == 0) | (n2 == 0) | ~(variancia > 0)] = np.nan
+
+        # Medianas por estatística de ordem: contagem acumulada de cada grupo na ordem crescente
+        acumulado = np.cumsum(dentro, axis=1, dtype=np.int32)
+        acumulado_restante = np.arange(1, self.n_validos + 1, dtype=np.int32) - acumulado
+        mediana_grupo = self._medianas_por_acumulado(acumulado, n1.astype(np.int64))
+        mediana_restante = self._medianas_por_acumulado(acumulado_restante, n2.astype(np.int64))
+
+        # Amostras pequenas sem empates: p exato (mesmo critério do scipy)
+        if not self.ha_empates:
+            for i in np.flatnonzero((np.minimum(n1, n2) <= 8) & (n1 > 0) & (n2 > 0)):
+                p_valor[i] = mannwhitneyu(self.valores_ordenados[dentro[i]], self.valores_ordenados[~dentro[i]],
+                                          alternative='two-sided').pvalue
+        return u1, p_valor, mediana_grupo, mediana_restante, n1.astype(np.int64), n2.astype(np.int64)
+
+    def postos_no_subconjunto(self, dentro):
+        # Re-ranqueia só os elementos de um subconjunto (dentro, na ordem crescente) sem reordenar:
+        # posto = nº de elementos do subconjunto nos grupos de empate anteriores + posto médio no grupo.
+        # Retorna (postos na ordem crescente dos selecionados, termo de empates sum(t^3 - t) do subconjunto).
+        grupos = self.grupo_ordenado[dentro]
+        por_grupo = np.bincount(grupos, minlength=len(self.tamanhos_grupos)).astype(float)
+        postos_grupo = np.cumsum(por_grupo) - por_grupo + (por_grupo + 1) / 2
+        return postos_grupo[grupos], float(np.sum(por_grupo ** 3 - por_grupo))
+
+    def kruskal_dunn(self, codigos, n_grupos, dentro=None, metodo_correcao='holm'):
+        # Kruskal-Wallis H (com correção de empates) e Dunn par a par para grupos codificados 0..n_grupos-1.
+        # codigos: por linha do DataFrame (códigos < 0 ficam de fora); dentro: máscara do contexto (ordem crescente).
+        codigos_ordenados = np.asarray(codigos)[self.ordem]
+        selecionados = (codigos_ordenados >= 0) & (codigos_ordenados < n_grupos)
+        if dentro is not None:
+            selecionados &= dentro
+        postos, termo_empates = self.postos_no_subconjunto(selecionados)
+        grupos = codigos_ordenados[selecionados].astype(np.int64)
+
+        tamanhos = np.bincount(grupos, minlength=n_grupos).astype(float)
+        somas = np.bincount(grupos, weights=postos, minlength=n_grupos)
+        n = float(len(postos))
+        presentes = tamanhos > 0
+        resultado = {'n': int(n), 'tamanhos': tamanhos.astype(np.int64), 'H': np.nan, 'gl': int(presentes.sum()) - 1,
+                     'p_valor': np.nan, 'postos_medios': np.full(n_grupos, np.nan), 'pares': []}
+        resultado['postos_medios'][presentes] = somas[presentes] / tamanhos[presentes]
+        fator_empates = 1 - termo_empates / (n ** 3 - n) if n > 1 else 0.0
+        if resultado['gl'] < 1 or fator_empates <= 0:
+            return resultado
+
+        h = (12 / (n * (n + 1)) * np.sum(somas[presentes] ** 2 / tamanhos[presentes]) - 3 * (n + 1)) / fator_empates
+        resultado['H'] = float(h)
+        resultado['p_valor'] = float(stats.chi2.sf(h, resultado['gl']))
+
+        # Dunn: todos os pares de grupos presentes de uma vez (triângulo superior)
+        i, j = np.triu_indices(n_grupos, k=1)
+        validos = presentes[i] & presentes[j]
+        i, j = i[validos], j[validos]
+        variancia_base = n * (n + 1) / 12 - termo_empates / (12 * (n - 1))
+        z = (resultado['postos_medios'][i] - resultado['postos_medios'][j]) / np.sqrt(variancia_base * (1 / tamanhos[i] + 1 / tamanhos[j]))
+        p_pares = 2 * special.ndtr(-np.abs(z))
+        resultado['pares'] = list(zip(i.tolist(), j.tolist(), z.tolist(), p_pares.tolist(),
+                                      ajustar_p_valores(p_pares, metodo_correcao).tolist()))
+        return resultado
+
+    def _medianas_por_acumulado(self, acumulado, tamanhos):
+        medianas = np.full(len(tamanhos), np.nan)
+        com_dados = tamanhos > 0
+        if not np.any(com_dados):
+            return medianas
+        acumulado = acumulado[com_dados]
+        tamanhos = tamanhos[com_dados]
+        # Posição do k-ésimo elemento (0-based) = primeira coluna onde o acumulado passa de k
+        pos_baixo = np.argmax(acumulado > ((tamanhos - 1) // 2)[:, None], axis=1)
+        pos_alto = np.argmax(acumulado > (tamanhos // 2)[:, None], axis=1)
+        medianas[com_dados] = (self.valores_ordenados[pos_baixo] + self.valores_ordenados[pos_alto]) / 2
+        return medianas
@@ -0,0 +1,51 @@
+import io
+from functools import lru_cache
+
+from matplotlib.figure import Figure
+
+from cubo_burnout import NIVEIS_BURNOUT
+
+CORES_NIVEIS = ['#4CAF50', '#FFEB3B', '#FF9800', '#F44336', '#B71C1C']
+
+
+def _rotulos_barras(contagens):
+    total = sum(contagens)
+    return [f"{count} ({((count/total)*100):.1f}%)" if total > 0 else f"{count} (0.0%)" for count in contagens]
+
+
+# --- Gráfico de barras da distribuição (matplotlib), memorizado pelo vetor de 5 contagens ---
+# Usa Figure diretamente (fora do gerenciador de estado do pyplot): nada fica registrado entre reruns.
+@lru_cache(maxsize=128)
+def renderizar_distribuicao(contagens, formato='png', dpi=150):
+    contagens = tuple(int(c) for c in contagens)
+    fig = Figure(figsize=(10, 5))
+    try:
+        ax = fig.subplots()
+        bars = ax.bar(NIVEIS_BURNOUT, contagens, color=CORES_NIVEIS)
+        ax.set_title(f"Distribuição (N={sum(contagens)})"); ax.set_xlabel("Nível Risco"); ax.set_ylabel("Contagem")
+        ax.bar_label(bars, labels=_rotulos_barras(contagens), label_type='edge', padding=3, fontsize=9)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=formato, dpi=dpi, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+# --- Mesma visualização como especificação Vega-Lite (renderizada no navegador) ---
+def especificacao_vega_distribuicao(contagens):
+    contagens = [int(c) for c in contagens]
+    valores = [
+        {'Nível': nivel, 'Contagem': count, 'Rótulo': rotulo}
+        for nivel, count, rotulo in zip(NIVEIS_BURNOUT, contagens, _rotulos_barras(contagens))
+    ]
+    eixo_x = {'field': 'Nível', 'type': 'nominal', 'sort': NIVEIS_BURNOUT, 'title': "Nível Risco", 'axis': {'labelAngle': 0}}
+    return {
+        'title': f"Distribuição (N={sum(contagens)})",
+        'data': {'values': valores},
+        'encoding': {'x': eixo_x, 'y': {'field': 'Contagem', 'type': 'quantitative', 'title': "Contagem"}},
+        'layer': [
+            {'mark': 'bar', 'encoding': {'color': {'field': 'Nível', 'type': 'nominal', 'legend': None,
+                                                   'scale': {'domain': NIVEIS_BURNOUT, 'range': CORES_NIVEIS}}}},
+            {'mark': {'type': 'text', 'dy': -6, 'fontSize': 11}, 'encoding': {'text': {'field': 'Rótulo'}}},
+        ],
+    }
@@ -0,0 +1,198 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+LABEL_AUSENTE = "Não Informado"
+
+# --- Ordem de exibição das opções ordinais na barra lateral ---
+ORDEM_IDADE = ['Até 20 anos', '21-30 anos', '31-40 anos', '41-50 anos', '51-60 anos', '61+ anos', LABEL_AUSENTE]
+ORDEM_TEMPO = ['0 anos', '1-5 anos', '6-10 anos', '11-20 anos', '21+ anos', LABEL_AUSENTE]
+ORDEM_CARGA = ['Até 20h', '21-30h', '31-40h', '41-50h', '51+h', LABEL_AUSENTE]
+ORDEM_ESCALA_5P = ['Nunca', 'Raramente', 'Às vezes', 'Frequentemente', 'Sempre', LABEL_AUSENTE]
+
+# --- Dimensões de filtro (coluna -> ordem das opções; None = ordem alfabética) ---
+DIMENSOES_FILTRO = {
+    'b1_2_genero': None,
+    'Faixa_Etaria': ORDEM_IDADE,
+    'Faixa_Tempo_Profissao': ORDEM_TEMPO,
+    'Faixa_Carga_Horaria': ORDEM_CARGA,
+    'Filtro_Instituicao': None,
+    'Filtro_Violencia': None,
+    'Filtro_Autocuidado': ORDEM_ESCALA_5P,
+    'Filtro_Lazer': ORDEM_ESCALA_5P,
+    'Filtro_Apoio_Gestao': ORDEM_ESCALA_5P,
+    'Filtro_Feedback': None,
+    'Filtro_Acompanhamento': None,
+}
+
+# Rótulos curtos das dimensões (texto de filtros aplicados e tabelas de resultados)
+ROTULOS_DIMENSOES = {
+    'b1_2_genero': "Gênero",
+    'Faixa_Etaria': "Idade",
+    'Faixa_Tempo_Profissao': "Tempo Prof.",
+    'Faixa_Carga_Horaria': "Carga",
+    'Filtro_Instituicao': "Instituição",
+    'Filtro_Violencia': "Violência",
+    'Filtro_Autocuidado': "Autocuidado",
+    'Filtro_Lazer': "Lazer",
+    'Filtro_Apoio_Gestao': "Apoio Gestão",
+    'Filtro_Feedback': "Feedback",
+    'Filtro_Acompanhamento': "Acompanhamento",
+}
+ROTULO_NIVEIS = "Nível(is)"
+
+
+# --- Função para criar Faixas (Bins) para filtros numéricos ---
+def criar_faixas_filtros(df):
+    # Faixas Numéricas (Idade, Tempo, Carga)
+    if 'b1_1_idade' in df.columns:
+        bins_idade = [0, 20, 30, 40, 50, 60, 100]
+        labels_idade = ORDEM_IDADE[:-1]
+        df['Faixa_Etaria'] = pd.cut(df['b1_1_idade'], bins=bins_idade, labels=labels_idade, right=True).astype('object').fillna(LABEL_AUSENTE)
+
+    if 'b3_2_tempo_profissao' in df.columns:
+        bins_tempo = [-1, 0, 5, 10, 20, 50]
+        labels_tempo = ORDEM_TEMPO[:-1]
+        df['Faixa_Tempo_Profissao'] = pd.cut(df['b3_2_tempo_profissao'], bins=bins_tempo, labels=labels_tempo, right=True).astype('object').fillna(LABEL_AUSENTE)
+
+    if 'b3_5_carga_horaria' in df.columns:
+        bins_carga = [0, 20, 30, 40, 50, 150]
+        labels_carga = ORDEM_CARGA[:-1]
+        df['Faixa_Carga_Horaria'] = pd.cut(df['b3_5_carga_horaria'], bins=bins_carga, labels=labels_carga, right=True).astype('object').fillna(LABEL_AUSENTE)
+
+    # Mapear colunas Sim/Não (0/1)
+    if 'b4_4_violencia_trabalho' in df.columns:
+        df['Filtro_Violencia'] = df['b4_4_violencia_trabalho'].map({0.0: 'Não', 1.0: 'Sim'}).fillna(LABEL_AUSENTE)
+    if 'b2_1_acompanhamento_agrupado' in df.columns:
+        df['Filtro_Acompanhamento'] = df['b2_1_acompanhamento_agrupado'].map({0.0: 'Não', 1.0: 'Sim'}).fillna(LABEL_AUSENTE)
+    if 'b4_3_cultura_feedback' in df.columns:
+        df['Filtro_Feedback'] = df['b4_3_cultura_feedback'].map({0.0: 'Não', 1.0: 'Sim'}).fillna(LABEL_AUSENTE)
+
+    # Mapear colunas de Instituição (0/1/2)
+    if 'b3_7_grupo_instituicao' in df.columns:
+        df['Filtro_Instituicao'] = df['b3_7_grupo_instituicao'].map({0.0: 'Somente Pública', 1.0: 'Somente Privada', 2.0: 'Ambas (Pública e Privada)'}).fillna(LABEL_AUSENTE)
+
+    # Escalas de 1-5 (o valor salvo na Célula 2 é numérico)
+    mapa_escala_5pontos_texto = dict(zip([1.0, 2.0, 3.0, 4.0, 5.0], ORDEM_ESCALA_5P[:-1]))
+    if 'b2_2_frequencia_autocuidado' in df.columns:
+        df['Filtro_Autocuidado'] = df['b2_2_frequencia_autocuidado'].map(mapa_escala_5pontos_texto).fillna(LABEL_AUSENTE)
+    if 'b2_3_tempo_energia_lazer' in df.columns:
+        df['Filtro_Lazer'] = df['b2_3_tempo_energia_lazer'].map(mapa_escala_5pontos_texto).fillna(LABEL_AUSENTE)
+    if 'b4_7_apoio_gestao_escolar' in df.columns:
+        df['Filtro_Apoio_Gestao'] = df['b4_7_apoio_gestao_escolar'].map(mapa_escala_5pontos_texto).fillna(LABEL_AUSENTE)
+
+    return df
+
+
+# Colunas necessárias para a dashboard (após a criação das faixas)
+COLUNAS_NECESSARIAS = [
+    'b1_2_genero', 'b3_3_nivel_ensino', 'Nivel_Burnout', 'ET',
+    'Faixa_Etaria', 'Faixa_Tempo_Profissao', 'Faixa_Carga_Horaria',
+    'Filtro_Violencia', 'Filtro_Acompanhamento', 'Filtro_Feedback', 'Filtro_Instituicao',
+    'Filtro_Autocuidado', 'Filtro_Lazer', 'Filtro_Apoio_Gestao'
+]
+
+
+# --- Base de filtros: colunas derivadas calculadas uma única vez, sem alterar o DataFrame original ---
+def preparar_base(df_bruto):
+    # Cópia rasa: as colunas originais são compartilhadas, só as derivadas/normalizadas são novas
+    df = criar_faixas_filtros(df_bruto.copy(deep=False))
+    if any(col not in df.columns for col in COLUNAS_NECESSARIAS):
+        return df, None
+    df['Nivel_Burnout'] = df['Nivel_Burnout'].astype(str)
+    df['b3_3_nivel_ensino'] = df['b3_3_nivel_ensino'].astype(str).fillna(LABEL_AUSENTE)
+    df['b1_2_genero'] = df['b1_2_genero'].fillna(LABEL_AUSENTE).astype(str)
+    return df, ModeloFiltros(df)
+
+
+# Coluna multivalorada (níveis separados por ';') e valores que não são opções de filtro
+COLUNA_NIVEIS = 'b3_3_nivel_ensino'
+NIVEIS_IGNORADOS = {'nan', 'aposentada'}
+
+
+# --- Matriz esparsa de pertencimento (respondente x nível de ensino) ---
+def explodir_niveis(serie):
+    # Cada valor distinto é separado uma única vez; as linhas herdam o resultado pelo código do valor
+    codigos, unicos = pd.factorize(serie)
+    partes_por_unico = [[parte.strip() for parte in str(item).split(';')] for item in unicos]
+    niveis = sorted({parte for partes in partes_por_unico for parte in partes
+                     if parte and parte.lower() not in NIVEIS_IGNORADOS})
+    posicao = {nivel: j for j, nivel in enumerate(niveis)}
+
+    linhas_u, colunas_u = [], []
+    for i, partes in enumerate(partes_por_unico):
+        for j in {posicao[parte] for parte in partes if parte in posicao}:
+            linhas_u.append(i)
+            colunas_u.append(j)
+    # Linha extra (vazia) para valores ausentes (código -1 do factorize)
+    por_unico = sparse.csr_matrix((np.ones(len(linhas_u), dtype=bool), (linhas_u, colunas_u)),
+                                  shape=(len(unicos) + 1, len(niveis)))
+    codigos = np.where(codigos < 0, len(unicos), codigos)
+    return niveis, por_unico[codigos].tocsc()
+
+
+# --- Chave curta de uma máscara de filtro (para caches por seleção) ---
+def chave_mascara(mascara):
+    return hashlib.blake2b(np.packbits(np.asarray(mascara, dtype=bool)).tobytes(), digest_size=16).hexdigest()
+
+
+def _somente_leitura(arr):
+    arr.flags.writeable = False
+    return arr
+
+
+# --- Modelo de filtros: cada dimensão vira código inteiro + bitmask por opção ---
+class ModeloFiltros:
+    def __init__(self, df, dimensoes=DIMENSOES_FILTRO):
+        self.n_linhas = len(df)
+        self.categorias = {}  # coluna -> lista de opções na ordem da barra lateral
+        self.codigos = {}     # coluna -> códigos inteiros (posição em categorias; -1 = fora)
+        self._bitmasks = {}   # coluna -> matriz (n_opcoes, ceil(n/8)) de bits empacotados
+
+        for coluna, ordem in dimensoes.items():
+            valores = df[coluna].astype(str)
+            presentes = set(pd.unique(valores))
+            if ordem is None:
+                categorias = sorted(presentes)
+            else:
+                categorias = [label for label in ordem if label in presentes]
+            # Dtype dos códigos do próprio pandas (int8 até 127 opções, int16 além disso): sem estouro
+            codigos = pd.Categorical(valores, categories=categorias).codes
+            bitmasks = np.packbits(codigos[None, :] == np.arange(len(categorias), dtype=codigos.dtype)[:, None], axis=1)
+
+            self.categorias[coluna] = categorias
+            self.codigos[coluna] = _somente_leitura(codigos)
+            self._bitmasks[coluna] = _somente_leitura(bitmasks)
+
+        # Níveis de ensino: matriz de pertencimento + bitmask por nível (filtro = AND de colunas)
+        self.niveis, self.matriz_niveis = [], None
+        self._bitmasks_niveis = np.zeros((0, (self.n_linhas + 7) // 8), dtype=np.uint8)
+        if COLUNA_NIVEIS in df.columns:
+            self.niveis, self.matriz_niveis = explodir_niveis(df[COLUNA_NIVEIS])
+            self._bitmasks_niveis = _somente_leitura(np.packbits(self.matriz_niveis.T.toarray(), axis=1))
+
+    def opcoes(self, coluna):
+        return list(self.categorias[coluna])
+
+    def bitmask(self, coluna, opcao):
+        try:
+            return self._bitmasks[coluna][self.categorias[coluna].index(opcao)]
+        except ValueError:  # Opção inexistente no dataset: nenhuma linha
+            return np.zeros((self.n_linhas + 7) // 8, dtype=np.uint8)
+
+    def bitmask_nivel(self, nivel):
+        try:
+            return self._bitmasks_niveis[self.niveis.index(nivel)]
+        except ValueError:
+            return np.zeros((self.n_linhas + 7) // 8, dtype=np.uint8)
+
+    def mascara(self, selecoes, niveis=()):
+        # selecoes: {coluna: opção}; niveis: respondente precisa atuar em TODOS os níveis listados
+        bitmasks = [self.bitmask(coluna, opcao) for coluna, opcao in selecoes.items()]
+        bitmasks.extend(self.bitmask_nivel(nivel) for nivel in niveis)
+        if not bitmasks:
+            return np.ones(self.n_linhas, dtype=bool)
+        combinada = np.bitwise_and.reduce(np.vstack(bitmasks), axis=0)
+        return np.unpackbits(combinada, count=self.n_linhas).astype(bool)
@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+# Arquivo JSON-lines com uma linha por execução (rerun) da dashboard
+ARQUIVO_TRACE = 'perfil_execucoes.jsonl'
+MAX_EXECUCOES_AGREGADAS = 500
+# Acima deste tamanho o trace vira '<arquivo>.1' (uma geração antiga) e recomeça
+LIMITE_BYTES_TRACE = 5 << 20
+BYTES_LEITURA = 1 << 16
+
+COLUNAS_ETAPAS = ['Etapa', 'Tempo (ms)', 'Pico Memória (MB)', 'Linhas']
+COLUNAS_AGREGADO = ['Etapa', 'Execuções', 'Tempo p50 (ms)', 'Tempo p95 (ms)', 'Pico Memória p95 (MB)', 'Linhas (última)']
+
+
+# Sessões que pediram medição de memória (sessão -> último rerun): o tracemalloc é do processo
+# inteiro e só é desligado quando nenhuma sessão pede mais (uma sessão não interrompe a medição
+# de outra). Sessões sem rerun há mais de TTL_SESSAO_MEMORIA (ex.: aba fechada) deixam de contar.
+TTL_SESSAO_MEMORIA = 600
+_SESSOES_MEMORIA = {}
+_TRAVA_MEMORIA = threading.Lock()
+
+
+def _atualizar_rastreamento(sessao, medir_memoria):
+    with _TRAVA_MEMORIA:
+        agora = time.monotonic()
+        for antiga in [s for s, visto in _SESSOES_MEMORIA.items() if agora - visto > TTL_SESSAO_MEMORIA]:
+            del _SESSOES_MEMORIA[antiga]
+        if medir_memoria:
+            _SESSOES_MEMORIA[sessao] = agora
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        else:
+            _SESSOES_MEMORIA.pop(sessao, None)
+            if not _SESSOES_MEMORIA and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+# --- Medição por etapa de uma execução: tempo de parede, pico de memória e nº de linhas ---
+# Memória via tracemalloc (opcional: deixa as alocações mais lentas). O rastreamento e o pico
+# são do processo inteiro: com várias sessões simultâneas o pico é aproximado nos dois sentidos
+# (inclui alocações das outras sessões, e o reset_peak de uma etapa alheia zera o desta).
+class PerfilExecucao:
+    def __init__(self, medir_memoria=False, sessao=None):
+        self.etapas = []
+        self.medir_memoria = medir_memoria
+        self._inicio = time.perf_counter()
+        _atualizar_rastreamento(sessao, medir_memoria)
+
+    @contextmanager
+    def etapa(self, nome, linhas=None):
+        # O registro é entregue ao bloco, que pode preencher 'linhas' depois de calcular
+        registro = {'etapa': nome, 'tempo_ms': None, 'pico_mb': None, 'linhas': linhas}
+        if self.medir_memoria:
+            tracemalloc.reset_peak()
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            registro['tempo_ms'] = (time.perf_counter() - inicio) * 1000
+            if self.medir_memoria and tracemalloc.is_tracing():
+                registro['pico_mb'] = max(tracemalloc.get_traced_memory()[1] - memoria_inicial, 0) / 1e6
+            if registro['linhas'] is not None:
+                registro['linhas'] = int(registro['linhas'])
+            self.etapas.append(registro)
+
+    def tempo_total_ms(self):
+        return (time.perf_counter() - self._inicio) * 1000
+
+    def tabela(self):
+        tabela = pd.DataFrame(
+            [(r['etapa'], r['tempo_ms'], r['pico_mb'], r['linhas']) for r in self.etapas],
+            columns=COLUNAS_ETAPAS,
+        )
+        tabela['Linhas'] = tabela['Linhas'].astype('Int64')
+        return tabela
+
+    def registro(self, **contexto):
+        return {
+            'instante': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'total_ms': self.tempo_total_ms(),
+            **contexto,
+            'etapas': self.etapas,
+        }
+
+
+# --- Arquivo de trace: acrescenta uma linha por execução (com rotação por tamanho) ---
+def gravar_trace(registro, caminho=ARQUIVO_TRACE, limite_bytes=LIMITE_BYTES_TRACE):
+    try:
+        if os.path.getsize(caminho) >= limite_bytes:
+            os.replace(caminho, caminho + '.1')
+    except FileNotFoundError:
+        pass
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+
+def _linhas_finais(caminho, ultimas):
+    # Lê o arquivo de trás para frente em blocos, só até ter as últimas linhas completas
+    with open(caminho, 'rb') as f:
+        posicao = f.seek(0, os.SEEK_END)
+        dados = b''
+        while posicao > 0 and dados.count(b'\n') <= ultimas:
+            inicio = max(0, posicao - BYTES_LEITURA)
+            f.seek(inicio)
+            dados = f.read(posicao - inicio) + dados
+            posicao = inicio
+    linhas = dados.split(b'\n')
+    if posicao > 0:
+        linhas = linhas[1:]  # primeira linha incompleta
+    return linhas[-ultimas - 1:]
+
+
+def ler_trace(caminho=ARQUIVO_TRACE, ultimas=MAX_EXECUCOES_AGREGADAS):
+    # Só as últimas execuções (linhas corrompidas, ex. gravação interrompida, são ignoradas)
+    registros = deque(maxlen=ultimas)
+    try:
+        linhas = _linhas_finais(caminho, ultimas)
+    except FileNotFoundError:
+        return []
+    for linha in linhas:
+        try:
+            registros.append(json.loads(linha))
+        except ValueError:
+            continue
+    return list(registros)
+
+
+# --- Agregados p50/p95 por etapa (na ordem em que as etapas aparecem; 'Total' por último) ---
+def agregar_trace(registros):
+    por_etapa = {}
+    for registro in registros:
+        etapas = registro.get('etapas', []) + [{'etapa': 'Total', 'tempo_ms': registro.get('total_ms')}]
+        for etapa in etapas:
+            if etapa.get('tempo_ms') is None:
+                continue
+            valores = por_etapa.setdefault(etapa['etapa'], {'tempo': [], 'pico': [], 'linhas': None})
+            valores['tempo'].append(etapa['tempo_ms'])
+            if etapa.get('pico_mb') is not None:
+                valores['pico'].append(etapa['pico_mb'])
+            if etapa.get('linhas') is not None:
+                valores['linhas'] = etapa['linhas']
+
+    if 'Total' in por_etapa:
+        por_etapa['Total'] = por_etapa.pop('Total')
+    linhas = []
+    for nome, valores in por_etapa.items():
+        p50, p95 = np.percentile(valores['tempo'], [50, 95])
+        pico95 = np.percentile(valores['pico'], 95) if valores['pico'] else np.nan
+        linhas.append((nome, len(valores['tempo']), p50, p95, pico95, valores['linhas']))
+    tabela = pd.DataFrame(linhas, columns=COLUNAS_AGREGADO)
+    tabela['Linhas (última)'] = tabela['Linhas (última)'].astype('Int64')
+    return tabela
+
+
+# Ex.: python perfil.py --trace perfil_execucoes.jsonl --ultimas 200
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Resumo (p50/p95 por etapa) do trace de execuções da dashboard.")
+    parser.add_argument('--trace', default=os.environ.get('BURNOUT_PERFIL_TRACE', ARQUIVO_TRACE))
+    parser.add_argument('--ultimas', type=int, default=MAX_EXECUCOES_AGREGADAS)
+    args = parser.parse_args()
+
+    registros = ler_trace(args.trace, args.ultimas)
+    if not registros:
+        raise SystemExit(f"Nenhuma execução registrada em '{args.trace}'.")
+    with pd.option_context('display.width', 160, 'display.float_format', '{:.2f}'.format):
+        print(f"{len(registros)} execuções em '{args.trace}':")
+        print(agregar_trace(registros).to_string(index=False))
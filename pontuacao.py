@@ -0,0 +1,247 @@
+import argparse
+import csv
+import glob
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:  # pyarrow é necessário para gravar a saída colunar
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+# --- Esquema da exportação bruta (mesmas colunas do CSV limpo, antes das colunas derivadas) ---
+COLUNAS_ITENS = [f'Q{i}' for i in range(1, 21)]
+COLUNAS_TEXTO = [
+    'b1_2_genero', 'b1_3_estado_civil', 'b1_4_filhos', 'b3_1_escolaridade', 'b3_3_nivel_ensino',
+    'b3_4_area_formacao', 'b3_6_num_instituicoes', 'b3_7_tipo_instituicao',
+]
+COLUNAS_DERIVADAS = [
+    'b2_1_acompanhamento_agrupado', 'b3_7_tipo_instituicao_str', 'b3_7_grupo_instituicao',
+    'Q9_inv', 'ET', 'Nivel_Burnout',
+]
+
+# Níveis do questionário (ET de 20 a 100): limites superiores de cada faixa
+LIMITES_NIVEIS = [20, 40, 60, 80]
+ROTULOS_NIVEIS = np.array(['Nível 1', 'Nível 2', 'Nível 3', 'Nível 4', 'Nível 5', 'Inválido'], dtype=object)
+
+ARQUIVO_ESTADO = 'estado.json'
+BYTES_CAUDA = 1 << 16
+
+
+# --- Pontuação vetorizada de um bloco de respostas ---
+def pontuar_bloco(bloco):
+    faltando = [coluna for coluna in COLUNAS_ITENS if coluna not in bloco.columns]
+    if faltando:
+        raise ValueError(f"Exportação sem os itens: {', '.join(faltando)}")
+    bloco = bloco.copy()
+    for coluna in bloco.columns:
+        if coluna in COLUNAS_TEXTO:
+            continue
+        bloco[coluna] = pd.to_numeric(bloco[coluna], errors='coerce')
+
+    # Itens Q1-Q20 (escala 1-5); Q9 é invertido. Resposta fora da escala invalida o escore.
+    itens = bloco[COLUNAS_ITENS].to_numpy(dtype=float, na_value=np.nan)
+    validos = np.all((itens >= 1) & (itens <= 5), axis=1)
+    q9_inv = 6 - itens[:, COLUNAS_ITENS.index('Q9')]
+    et = itens.sum(axis=1) - itens[:, COLUNAS_ITENS.index('Q9')] + q9_inv
+    nivel = np.where(validos, np.searchsorted(LIMITES_NIVEIS, et, side='left'), len(ROTULOS_NIVEIS) - 1)
+
+    for coluna in COLUNAS_ITENS:
+        bloco[coluna] = bloco[coluna].astype('Int64')
+    # Acompanhamento de saúde: 0 = não faz, 1-3 (qualquer frequência) = faz
+    acompanhamento = bloco.get('b2_1_acompanhamento_saude', pd.Series(np.nan, index=bloco.index))
+    bloco['b2_1_acompanhamento_agrupado'] = np.where(acompanhamento.isna(), np.nan, (acompanhamento > 0).astype(float))
+
+    # Instituição: 0 = só pública, 1 = só privada, 2 = ambas, NaN = não atua
+    tipo = bloco.get('b3_7_tipo_instituicao', pd.Series(np.nan, index=bloco.index, dtype=object))
+    bloco['b3_7_tipo_instituicao_str'] = tipo
+    publica = tipo.str.contains('Rede Pública', regex=False, na=False).to_numpy()
+    privada = tipo.str.contains('Rede Privada', regex=False, na=False).to_numpy()
+    bloco['b3_7_grupo_instituicao'] = np.select([publica & privada, privada, publica], [2.0, 1.0, 0.0], default=np.nan)
+
+    bloco['Q9_inv'] = pd.array(np.where(np.isnan(q9_inv), None, q9_inv), dtype='Int64')
+    bloco['ET'] = pd.array(np.where(validos, et, None), dtype='Int64')
+    bloco['Nivel_Burnout'] = ROTULOS_NIVEIS[nivel]
+    return bloco
+
+
+def _esquema(colunas):
+    campos = []
+    for coluna in colunas:
+        if coluna in COLUNAS_TEXTO or coluna in ('b3_7_tipo_instituicao_str', 'Nivel_Burnout'):
+            tipo = pa.string()
+        elif coluna in COLUNAS_ITENS or coluna in ('Q9_inv', 'ET'):
+            tipo = pa.int64()
+        else:
+            tipo = pa.float64()
+        campos.append(pa.field(coluna, tipo))
+    return pa.schema(campos)
+
+
+# --- Leitura incremental: só os bytes anexados desde a última execução, até a última linha completa ---
+class _LeitorLimitado(io.RawIOBase):
+    def __init__(self, arquivo, limite):
+        self._arquivo = arquivo
+        self._restante = limite
+
+    def readable(self):
+        return True
+
+    def readinto(self, destino):
+        n = min(len(destino), self._restante)
+        dados = self._arquivo.read(n)
+        destino[:len(dados)] = dados
+        self._restante -= len(dados)
+        return len(dados)
+
+
+def _fim_ultima_linha(arquivo, tamanho):
+    # Posição logo após o último '\n' (linhas ainda sendo gravadas ficam para a próxima execução)
+    posicao = tamanho
+    while posicao > 0:
+        inicio = max(0, posicao - BYTES_CAUDA)
+        arquivo.seek(inicio)
+        trecho = arquivo.read(posicao - inicio)
+        quebra = trecho.rfind(b'\n')
+        if quebra >= 0:
+            return inicio + quebra + 1
+        posicao = inicio
+    return 0
+
+
+def _hash_cauda(arquivo, offset):
+    arquivo.seek(max(0, offset - BYTES_CAUDA))
+    return hashlib.sha256(arquivo.read(offset - max(0, offset - BYTES_CAUDA))).hexdigest()
+
+
+def _partes_apos(destino, n_partes):
+    return [parte for parte in glob.glob(os.path.join(destino, 'parte-*.arrow'))
+            if int(os.path.basename(parte)[6:11]) >= n_partes]
+
+
+def _anexar_csv(bloco, csv_saida):
+    existe = os.path.exists(csv_saida)
+    bloco.to_csv(csv_saida, sep=';', index=False, mode='a', header=not existe,
+                 encoding='utf-8' if existe else 'utf-8-sig')
+
+
+def _reconstruir_csv(destino, n_partes, csv_saida):
+    # CSV novo (ou de outra execução) a partir das partes já pontuadas, antes de anexar os blocos novos
+    temporario = csv_saida + '.tmp'
+    if os.path.exists(temporario):
+        os.remove(temporario)
+    for i in range(n_partes):
+        bloco = feather.read_table(os.path.join(destino, f"parte-{i:05d}.arrow")) \
+            .to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+        # Como o pd.to_numeric do bloco original: coluna sem ausentes e só com inteiros volta a ser int
+        # (o CSV reconstruído é lido com os mesmos tipos que o gravado bloco a bloco)
+        for coluna in bloco.columns[bloco.dtypes == np.float64]:
+            valores = bloco[coluna].to_numpy()
+            if not np.isnan(valores).any() and np.array_equal(valores, np.round(valores)):
+                bloco[coluna] = valores.astype(np.int64)
+        _anexar_csv(bloco, temporario)
+    if os.path.exists(temporario):
+        os.replace(temporario, csv_saida)
+    elif os.path.exists(csv_saida):
+        os.remove(csv_saida)
+
+
+def _ler_estado(destino):
+    try:
+        with open(os.path.join(destino, ARQUIVO_ESTADO), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# --- Pipeline: exportação bruta -> partes Arrow pontuadas (e CSV limpo opcional) ---
+def processar_exportacao(arquivo_bruto, destino='dados_limpos', tamanho_bloco=50_000, sep=';', csv_saida=None):
+    if feather is None:
+        raise ImportError("pyarrow é necessário para gravar a saída colunar.")
+    os.makedirs(destino, exist_ok=True)
+    estado = _ler_estado(destino)
+
+    with open(arquivo_bruto, 'rb') as arquivo:
+        linha_cabecalho = arquivo.readline()
+        cabecalho = next(csv.reader([linha_cabecalho.decode('utf-8-sig')], delimiter=sep))
+        cabecalho = [coluna.strip() for coluna in cabecalho]
+        tamanho = os.fstat(arquivo.fileno()).st_size
+
+        # Continua de onde parou só se o arquivo apenas cresceu (mesmo cabeçalho e mesmo final já processado)
+        incremental = (
+            estado is not None
+            and estado.get('cabecalho') == cabecalho
+            and estado.get('offset', 0) <= tamanho
+            and estado.get('hash_cauda') == _hash_cauda(arquivo, estado.get('offset', 0))
+        )
+        if not incremental:
+            for parte in glob.glob(os.path.join(destino, 'parte-*.arrow')):
+                os.remove(parte)
+            if csv_saida and os.path.exists(csv_saida):
+                os.remove(csv_saida)
+            estado = {'cabecalho': cabecalho, 'offset': len(linha_cabecalho), 'linhas': 0, 'partes': 0}
+        else:
+            # Execução anterior interrompida no meio: descarta partes e linhas do CSV além do último estado gravado
+            for parte in _partes_apos(destino, estado['partes']):
+                os.remove(parte)
+            if csv_saida and os.path.exists(csv_saida) and estado.get('csv_saida') == os.path.abspath(csv_saida):
+                if estado.get('tamanho_csv', 0) == 0:
+                    os.remove(csv_saida)  # sem cabeçalho gravado: o próximo bloco recria o arquivo
+                else:
+                    with open(csv_saida, 'r+b') as f:
+                        f.truncate(estado['tamanho_csv'])
+            elif csv_saida:
+                # CSV ausente ou nunca atualizado por esta pasta: não tem as linhas anteriores
+                _reconstruir_csv(destino, estado['partes'], csv_saida)
+
+        fim = _fim_ultima_linha(arquivo, tamanho)
+        novas_linhas = 0
+        if fim > estado['offset']:
+            arquivo.seek(estado['offset'])
+            leitor = io.BufferedReader(_LeitorLimitado(arquivo, fim - estado['offset']))
+            texto = io.TextIOWrapper(leitor, encoding='utf-8')
+            colunas_saida = cabecalho + [c for c in COLUNAS_DERIVADAS if c not in cabecalho]
+            esquema = _esquema(colunas_saida)
+            for bloco in pd.read_csv(texto, sep=sep, header=None, names=cabecalho, dtype=str, chunksize=tamanho_bloco):
+                pontuado = pontuar_bloco(bloco)[colunas_saida]
+                tabela = pa.Table.from_pandas(pontuado, schema=esquema, preserve_index=False)
+                caminho_parte = os.path.join(destino, f"parte-{estado['partes']:05d}.arrow")
+                feather.write_feather(tabela, caminho_parte, compression='uncompressed')
+                if csv_saida:
+                    _anexar_csv(pontuado, csv_saida)
+                estado['partes'] += 1
+                novas_linhas += len(pontuado)
+
+        estado['offset'] = fim if fim > estado['offset'] else estado['offset']
+        estado['linhas'] += novas_linhas
+        estado['hash_cauda'] = _hash_cauda(arquivo, estado['offset'])
+        if csv_saida:
+            estado['csv_saida'] = os.path.abspath(csv_saida)
+            estado['tamanho_csv'] = os.path.getsize(csv_saida) if os.path.exists(csv_saida) else 0
+
+    caminho_estado = os.path.join(destino, ARQUIVO_ESTADO)
+    with open(caminho_estado + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False)
+    os.replace(caminho_estado + '.tmp', caminho_estado)
+    return novas_linhas, estado['linhas']
+
+
+# Ex.: python pontuacao.py respostas_brutas.csv --destino dados_limpos --csv cleaned_data.csv
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pontua exportações brutas (Q1-Q20 -> ET, Nivel_Burnout) em blocos.")
+    parser.add_argument('arquivo_bruto')
+    parser.add_argument('--destino', default='dados_limpos', help="Pasta das partes Arrow pontuadas")
+    parser.add_argument('--csv', default=None, help="Também grava/atualiza o CSV limpo (formato da Célula 2)")
+    parser.add_argument('--bloco', type=int, default=50_000, help="Linhas por bloco")
+    parser.add_argument('--sep', default=';')
+    args = parser.parse_args()
+
+    novas, total = processar_exportacao(args.arquivo_bruto, args.destino, args.bloco, args.sep, args.csv)
+    print(f"{novas} respostas novas pontuadas ({total} no total) -> {args.destino}")
@@ -4,9 +4,19 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import io
+import os
+import uuid
 import warnings
-import re 
-from scipy.stats import mannwhitneyu, pearsonr, kruskal # Importações completas
+from comparacao_grupos import comparar_grupos
+from correlacoes import matriz_correlacoes, preparar_variaveis, tabela_correlacoes
+from bootstrap import intervalos_bootstrap, preparar_amostras
+from cubo_burnout import CuboBurnout
+from dados import carregar_dados, versao_arquivo
+from estatisticas import motor_da_coluna
+from graficos import especificacao_vega_distribuicao, renderizar_distribuicao
+from modelo_filtros import COLUNAS_NECESSARIAS, ROTULO_NIVEIS, ROTULOS_DIMENSOES, chave_mascara, preparar_base
+from perfil import ARQUIVO_TRACE, PerfilExecucao, agregar_trace, gravar_trace, ler_trace
+from varredura import varredura_significancia
 
 warnings.filterwarnings('ignore')
 st.set_page_config(layout="wide", page_title="Dashboard Burnout Docente - Filtros")
@@ -54,214 +64,219 @@ st.markdown("Análise do Equilíbrio entre a Demanda Profissional e o Bem-estar"
 st.markdown("Dashboard versão 1: Segmentação Interativa por Filtros")
 st.markdown("Autores: Hiro Martins Santos, Maria Clara da Silva e Rafaela Vieira dos Santos")
 
+# Copy-on-Write (padrão no pandas 3): recortes e derivações nunca alteram a base compartilhada
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# CSV limpo ou pasta de partes Arrow gerada por pontuacao.py (variável de ambiente BURNOUT_DADOS)
+ARQUIVO_DADOS = os.environ.get('BURNOUT_DADOS', 'cleaned_data.csv')
+# Trace das etapas de cada execução (JSON-lines); vazio desativa a gravação
+ARQUIVO_PERFIL = os.environ.get('BURNOUT_PERFIL_TRACE', ARQUIVO_TRACE)
+
 # --- Função SIMPLES para carregar dados JÁ LIMPOS do disco ---
-@st.cache_data
-def load_cleaned_data_from_disk(filepath='cleaned_data.csv'):
+# (usa o cache colunar em .cache_dados/, reconstruído só quando o CSV muda)
+# cache_resource: UMA cópia por processo, entregue a todas as sessões sem desserializar
+@st.cache_resource(max_entries=2)
+def _carregar_base_compartilhada(filepath, versao):
+    return carregar_dados(filepath)
+
+def load_cleaned_data_from_disk(filepath=ARQUIVO_DADOS):
     try:
-        df = pd.read_csv(filepath, encoding='utf-8-sig', sep=';')
+        df = _carregar_base_compartilhada(filepath, versao_dataset(filepath))
     except FileNotFoundError:
         st.error(f"Erro Crítico: O arquivo '{filepath}' não foi encontrado.")
-        st.info("Execute a Célula 2 (Limpeza) primeiro.")
+        st.info("Execute a Célula 2 (Limpeza) ou 'python pontuacao.py <exportação> --csv cleaned_data.csv' primeiro.")
         return None
     except Exception as e:
         st.error(f"Erro ao ler CSV: {e}")
         return None
     return df
 
-# --- Função para criar Faixas (Bins) para filtros numéricos (CORRIGIDA) ---
-def criar_faixas_filtros(df):
+# --- Versão do dataset (muda quando o CSV é regravado) ---
+def versao_dataset(filepath=ARQUIVO_DADOS):
     try:
-        LABEL_AUSENTE = "Não Informado" 
+        return versao_arquivo(filepath)
+    except OSError:
+        return None
 
-        # Faixas Numéricas (Idade, Tempo, Carga)
-        if 'b1_1_idade' in df.columns:
-            bins_idade = [0, 20, 30, 40, 50, 60, 100]
-            labels_idade = ['Até 20 anos', '21-30 anos', '31-40 anos', '41-50 anos', '51-60 anos', '61+ anos']
-            df['Faixa_Etaria'] = pd.cut(df['b1_1_idade'], bins=bins_idade, labels=labels_idade, right=True).astype('object').fillna(LABEL_AUSENTE)
-        
-        if 'b3_2_tempo_profissao' in df.columns:
-            bins_tempo = [-1, 0, 5, 10, 20, 50]
-            labels_tempo = ['0 anos', '1-5 anos', '6-10 anos', '11-20 anos', '21+ anos']
-            df['Faixa_Tempo_Profissao'] = pd.cut(df['b3_2_tempo_profissao'], bins=bins_tempo, labels=labels_tempo, right=True).astype('object').fillna(LABEL_AUSENTE)
-        
-        if 'b3_5_carga_horaria' in df.columns:
-            bins_carga = [0, 20, 30, 40, 50, 150]
-            labels_carga = ['Até 20h', '21-30h', '31-40h', '41-50h', '51+h']
-            df['Faixa_Carga_Horaria'] = pd.cut(df['b3_5_carga_horaria'], bins=bins_carga, labels=labels_carga, right=True).astype('object').fillna(LABEL_AUSENTE)
-        
-        # Mapear colunas Sim/Não (0/1)
-        if 'b4_4_violencia_trabalho' in df.columns:
-            df['Filtro_Violencia'] = df['b4_4_violencia_trabalho'].map({0.0: 'Não', 1.0: 'Sim'}).fillna(LABEL_AUSENTE)
-        if 'b2_1_acompanhamento_agrupado' in df.columns:
-            df['Filtro_Acompanhamento'] = df['b2_1_acompanhamento_agrupado'].map({0.0: 'Não', 1.0: 'Sim'}).fillna(LABEL_AUSENTE)
-        if 'b4_3_cultura_feedback' in df.columns:
-            df['Filtro_Feedback'] = df['b4_3_cultura_feedback'].map({0.0: 'Não', 1.0: 'Sim'}).fillna(LABEL_AUSENTE)
-        
-        # Mapear colunas de Instituição (0/1/2)
-        if 'b3_7_grupo_instituicao' in df.columns:
-            df['Filtro_Instituicao'] = df['b3_7_grupo_instituicao'].map({0.0: 'Somente Pública', 1.0: 'Somente Privada', 2.0: 'Ambas (Pública e Privada)'}).fillna(LABEL_AUSENTE)
-        
-        # --- INÍCIO DA MUDANÇA (Adicionar filtros de Escala 1-5) ---
-        mapa_escala_5pontos_texto = {
-            1.0: 'Nunca', 
-            2.0: 'Raramente', 
-            3.0: 'Às vezes', # Usamos 'Ás vezes' na Célula 2, mas o valor salvo é 3.0
-            4.0: 'Frequentemente', 
-            5.0: 'Sempre'
-        }
-        if 'b2_2_frequencia_autocuidado' in df.columns:
-            df['Filtro_Autocuidado'] = df['b2_2_frequencia_autocuidado'].map(mapa_escala_5pontos_texto).fillna(LABEL_AUSENTE)
-        if 'b2_3_tempo_energia_lazer' in df.columns:
-            df['Filtro_Lazer'] = df['b2_3_tempo_energia_lazer'].map(mapa_escala_5pontos_texto).fillna(LABEL_AUSENTE)
-        if 'b4_7_apoio_gestao_escolar' in df.columns:
-            df['Filtro_Apoio_Gestao'] = df['b4_7_apoio_gestao_escolar'].map(mapa_escala_5pontos_texto).fillna(LABEL_AUSENTE)
-        # --- FIM DA MUDANÇA ---
-            
-    except Exception as e:
-        st.error(f"Erro ao criar faixas de filtro: {e}")
-        
-    return df
+# --- Base de filtros construída UMA vez por versão do dataset (compartilhada entre sessões, somente leitura) ---
+@st.cache_resource(max_entries=2)
+def preparar_base_filtros(versao, _df):
+    return preparar_base(_df)
+
+# --- Cubo de contagens por Nível Burnout (uma vez por versão do dataset) ---
+@st.cache_resource(max_entries=2)
+def construir_cubo_burnout(versao, _df, _modelo):
+    return CuboBurnout(_df, _modelo)
+
+# --- Postos de ET para o teste de Mann-Whitney (uma vez por versão do dataset) ---
+@st.cache_resource(max_entries=2)
+def construir_motor_et(versao, _df):
+    return motor_da_coluna(_df['ET'])
+
+# --- Varredura de significância de todas as opções (uma vez por versão do dataset) ---
+@st.cache_data(show_spinner="Testando todas as opções de filtro...", max_entries=2)
+def calcular_varredura(versao, _modelo, _motor):
+    return varredura_significancia(_modelo, _motor)
+
+# --- Kruskal-Wallis + Dunn por versão do dataset e por contexto de filtro (máscara) ---
+@st.cache_data(max_entries=32)
+def calcular_comparacao_grupos(versao, chave_contexto, _modelo, _motor, _mascara):
+    return comparar_grupos(_modelo, _motor, _mascara)
+
+# --- Matrizes numéricas para correlação (uma vez por versão) e resultado por máscara de filtro ---
+@st.cache_resource(max_entries=2)
+def preparar_variaveis_correlacao(versao, _df):
+    return preparar_variaveis(_df)
+
+@st.cache_data(max_entries=16)
+def calcular_correlacoes(versao, chave_contexto, _variaveis, _mascara):
+    return matriz_correlacoes(_variaveis, _mascara)
+
+# --- Intervalos de confiança bootstrap (vetores uma vez por versão; resultado por máscara de filtro) ---
+@st.cache_resource(max_entries=2)
+def preparar_amostras_bootstrap(versao, _df):
+    return preparar_amostras(_df)
+
+@st.cache_data(max_entries=32, show_spinner="Calculando intervalos de confiança (bootstrap)...")
+def calcular_intervalos_bootstrap(versao, chave_contexto, medianas, _amostras, _mascara):
+    return intervalos_bootstrap(_amostras, _mascara, medianas=medianas)
 
 # --- Código Principal da Dashboard ---
-df = load_cleaned_data_from_disk()
+# Tempo/linhas de cada etapa em toda execução; pico de memória só com o painel de perfil ligado
+perfil = PerfilExecucao(medir_memoria=st.session_state.get('perfil_ativo', False),
+                        sessao=st.session_state.setdefault('perfil_sessao', uuid.uuid4().hex))
+with perfil.etapa("Carregar dados") as etapa:
+    versao = versao_dataset()
+    df = load_cleaned_data_from_disk()
+    etapa['linhas'] = len(df) if df is not None else 0
 
 if df is not None and not df.empty:
-    st.success("Arquivo 'cleaned_data.csv' carregado com sucesso!")
-    df = criar_faixas_filtros(df)
+    st.success(f"Arquivo '{ARQUIVO_DADOS}' carregado com sucesso!")
+    modelo = None; cubo = None; motor_et = None
+    try:
+        with perfil.etapa("Faixas de filtro", linhas=len(df)):
+            df, modelo = preparar_base_filtros(versao, df)
+    except Exception as e:
+        st.error(f"Erro ao criar faixas de filtro: {e}")
+    if modelo is not None:
+        try:
+            with perfil.etapa("Cubo Nível Burnout", linhas=len(df)):
+                cubo = construir_cubo_burnout(versao, df, modelo)
+        except Exception as e:
+            st.error(f"Erro ao construir o cubo de Nível Burnout: {e}")
+        try:
+            with perfil.etapa("Postos de ET", linhas=len(df)):
+                motor_et = construir_motor_et(versao, df)
+        except Exception as e:
+            st.error(f"Erro ao calcular os postos de ET: {e}")
     
-    # Atualiza a lista de colunas necessárias
-    colunas_necessarias = [
-        'b1_2_genero', 'b3_3_nivel_ensino', 'Nivel_Burnout', 'ET',
-        'Faixa_Etaria', 'Faixa_Tempo_Profissao', 'Faixa_Carga_Horaria',
-        'Filtro_Violencia', 'Filtro_Acompanhamento', 'Filtro_Feedback', 'Filtro_Instituicao',
-        'Filtro_Autocuidado', 'Filtro_Lazer', 'Filtro_Apoio_Gestao' # Adicionadas
-    ]
-    colunas_faltando = [col for col in colunas_necessarias if col not in df.columns]
+    colunas_faltando = [col for col in COLUNAS_NECESSARIAS if col not in df.columns]
 
     if colunas_faltando:
         st.error(f"Erro CSV: Colunas essenciais para os filtros ausentes: {', '.join(colunas_faltando)}")
-    else:
-        df['Nivel_Burnout'] = df['Nivel_Burnout'].astype(str)
-        df['b3_3_nivel_ensino'] = df['b3_3_nivel_ensino'].astype(str).fillna("Não Informado")
-        df['b1_2_genero'] = df['b1_2_genero'].astype(str).fillna("Não Informado")
-
+    elif modelo is not None:
         # --- BARRA LATERAL: Filtros de Segmentação (Versão 1.3 - Expandida) ---
+        # As opções vêm do modelo de filtros (pré-calculado), sem varrer o DataFrame a cada rerun
         st.sidebar.header("Filtros de Segmentação")
-        try:
-            # --- Filtros Demográficos ---
-            generos = ['Todos'] + sorted(list(df['b1_2_genero'].dropna().unique()))
-            genero_selecionado = st.sidebar.selectbox("Gênero:", generos)
+        with perfil.etapa("Opções da barra lateral", linhas=len(df)):
+            try:
+                # --- Filtros Demográficos ---
+                generos = ['Todos'] + modelo.opcoes('b1_2_genero')
+                genero_selecionado = st.sidebar.selectbox("Gênero:", generos)
             
-            ordem_idade = ['Até 20 anos', '21-30 anos', '31-40 anos', '41-50 anos', '51-60 anos', '61+ anos', 'Não Informado']
-            opcoes_idade_existentes = [label for label in ordem_idade if label in df['Faixa_Etaria'].unique()]
-            faixas_etarias = ['Todos'] + opcoes_idade_existentes
-            faixa_etaria_selecionada = st.sidebar.selectbox("Faixa Etária:", faixas_etarias)
-
-            ordem_tempo = ['0 anos', '1-5 anos', '6-10 anos', '11-20 anos', '21+ anos', 'Não Informado']
-            opcoes_tempo_existentes = [label for label in ordem_tempo if label in df['Faixa_Tempo_Profissao'].unique()]
-            faixas_tempo = ['Todos'] + opcoes_tempo_existentes
-            faixa_tempo_selecionada = st.sidebar.selectbox("Tempo de Profissão:", faixas_tempo)
-
-            # --- Filtros de Atuação (Demandas) ---
-            all_options = set()
-            for item in df['b3_3_nivel_ensino'].dropna().unique():
-                parts = [part.strip() for part in re.split(r'\s*;\s*', str(item))]
-                all_options.update(parts)
-            unique_niveis = sorted([opt for opt in all_options if opt and opt.lower() != 'nan' and opt.lower() != 'aposentada'])
-            niveis_selecionados = st.sidebar.multiselect("Nível(is) de Ensino:", options=unique_niveis, default=[])
+                faixas_etarias = ['Todos'] + modelo.opcoes('Faixa_Etaria')
+                faixa_etaria_selecionada = st.sidebar.selectbox("Faixa Etária:", faixas_etarias)
+
+                faixas_tempo = ['Todos'] + modelo.opcoes('Faixa_Tempo_Profissao')
+                faixa_tempo_selecionada = st.sidebar.selectbox("Tempo de Profissão:", faixas_tempo)
+
+                # --- Filtros de Atuação (Demandas) ---
+                niveis_selecionados = st.sidebar.multiselect("Nível(is) de Ensino:", options=modelo.niveis, default=[])
             
-            ordem_carga = ['Até 20h', '21-30h', '31-40h', '41-50h', '51+h', 'Não Informado']
-            opcoes_carga_existentes = [label for label in ordem_carga if label in df['Faixa_Carga_Horaria'].unique()]
-            faixas_carga = ['Todos'] + opcoes_carga_existentes
-            faixa_carga_selecionada = st.sidebar.selectbox("Faixa Carga Horária:", faixas_carga)
+                faixas_carga = ['Todos'] + modelo.opcoes('Faixa_Carga_Horaria')
+                faixa_carga_selecionada = st.sidebar.selectbox("Faixa Carga Horária:", faixas_carga)
 
-            opcoes_instituicao = ['Todos'] + sorted(list(df['Filtro_Instituicao'].unique()))
-            instituicao_selecionada = st.sidebar.selectbox("Tipo de Instituição:", opcoes_instituicao)
+                opcoes_instituicao = ['Todos'] + modelo.opcoes('Filtro_Instituicao')
+                instituicao_selecionada = st.sidebar.selectbox("Tipo de Instituição:", opcoes_instituicao)
 
-            opcoes_violencia = ['Todos'] + sorted(list(df['Filtro_Violencia'].unique()))
-            violencia_selecionada = st.sidebar.selectbox("Sofreu Violência?", opcoes_violencia)
+                opcoes_violencia = ['Todos'] + modelo.opcoes('Filtro_Violencia')
+                violencia_selecionada = st.sidebar.selectbox("Sofreu Violência?", opcoes_violencia)
 
-            # --- Filtros de Recursos (Pessoais e Org.) ---
-            ordem_escala_5p = ['Nunca', 'Raramente', 'Às vezes', 'Frequentemente', 'Sempre', 'Não Informado']
-            
-            opcoes_autocuidado = ['Todos'] + [label for label in ordem_escala_5p if label in df['Filtro_Autocuidado'].unique()]
-            autocuidado_selecionado = st.sidebar.selectbox("Frequência de Autocuidado:", opcoes_autocuidado)
+                # --- Filtros de Recursos (Pessoais e Org.) ---
+                opcoes_autocuidado = ['Todos'] + modelo.opcoes('Filtro_Autocuidado')
+                autocuidado_selecionado = st.sidebar.selectbox("Frequência de Autocuidado:", opcoes_autocuidado)
 
-            opcoes_lazer = ['Todos'] + [label for label in ordem_escala_5p if label in df['Filtro_Lazer'].unique()]
-            lazer_selecionado = st.sidebar.selectbox("Tempo/Energia para Lazer:", opcoes_lazer)
+                opcoes_lazer = ['Todos'] + modelo.opcoes('Filtro_Lazer')
+                lazer_selecionado = st.sidebar.selectbox("Tempo/Energia para Lazer:", opcoes_lazer)
 
-            opcoes_apoio_gestao = ['Todos'] + [label for label in ordem_escala_5p if label in df['Filtro_Apoio_Gestao'].unique()]
-            apoio_gestao_selecionado = st.sidebar.selectbox("Apoio da Gestão?", opcoes_apoio_gestao)
+                opcoes_apoio_gestao = ['Todos'] + modelo.opcoes('Filtro_Apoio_Gestao')
+                apoio_gestao_selecionado = st.sidebar.selectbox("Apoio da Gestão?", opcoes_apoio_gestao)
 
-            opcoes_feedback = ['Todos'] + sorted(list(df['Filtro_Feedback'].unique()))
-            feedback_selecionado = st.sidebar.selectbox("Cultura de Feedback?", opcoes_feedback)
+                opcoes_feedback = ['Todos'] + modelo.opcoes('Filtro_Feedback')
+                feedback_selecionado = st.sidebar.selectbox("Cultura de Feedback?", opcoes_feedback)
             
-            opcoes_acompanhamento = ['Todos'] + sorted(list(df['Filtro_Acompanhamento'].unique()))
-            acompanhamento_selecionado = st.sidebar.selectbox("Faz Acompanhamento?", opcoes_acompanhamento)
-
-        except Exception as e_sidebar:
-            st.sidebar.error(f"Erro ao criar filtros: {e_sidebar}")
-            # Reseta todos para 'Todos'
-            genero_selecionado = 'Todos'; niveis_selecionados = []
-            faixa_etaria_selecionada = 'Todas'; faixa_tempo_selecionada = 'Todas'
-            faixa_carga_selecionada = 'Todas'; violencia_selecionada = 'Todos'
-            acompanhamento_selecionado = 'Todos'; instituicao_selecionada = 'Todos'
-            autocuidado_selecionado = 'Todos'; lazer_selecionado = 'Todos'
-            apoio_gestao_selecionado = 'Todos'; feedback_selecionado = 'Todos'
-
-        # Aplicação dos Filtros
-        df_filtrado = df.copy()
-        filtros_aplicados_texto = []
+                opcoes_acompanhamento = ['Todos'] + modelo.opcoes('Filtro_Acompanhamento')
+                acompanhamento_selecionado = st.sidebar.selectbox("Faz Acompanhamento?", opcoes_acompanhamento)
+
+            except Exception as e_sidebar:
+                st.sidebar.error(f"Erro ao criar filtros: {e_sidebar}")
+                # Reseta todos para 'Todos'
+                genero_selecionado = 'Todos'; niveis_selecionados = []
+                faixa_etaria_selecionada = 'Todos'; faixa_tempo_selecionada = 'Todos'
+                faixa_carga_selecionada = 'Todos'; violencia_selecionada = 'Todos'
+                acompanhamento_selecionado = 'Todos'; instituicao_selecionada = 'Todos'
+                autocuidado_selecionado = 'Todos'; lazer_selecionado = 'Todos'
+                apoio_gestao_selecionado = 'Todos'; feedback_selecionado = 'Todos'
+
+        # Aplicação dos Filtros: (coluna, seleção) na ordem de exibição
+        filtros_sidebar = [
+            ('b1_2_genero', genero_selecionado),
+            ('Faixa_Etaria', faixa_etaria_selecionada),
+            ('Faixa_Tempo_Profissao', faixa_tempo_selecionada),
+            ('Faixa_Carga_Horaria', faixa_carga_selecionada),
+            ('Filtro_Violencia', violencia_selecionada),
+            ('Filtro_Acompanhamento', acompanhamento_selecionado),
+            ('Filtro_Instituicao', instituicao_selecionada),
+            ('Filtro_Autocuidado', autocuidado_selecionado),
+            ('Filtro_Lazer', lazer_selecionado),
+            ('Filtro_Apoio_Gestao', apoio_gestao_selecionado),
+            ('Filtro_Feedback', feedback_selecionado),
+        ]
+        selecoes = {coluna: valor for coluna, valor in filtros_sidebar if valor != 'Todos'}
+        filtros_aplicados_texto = [f"{ROTULOS_DIMENSOES[coluna]}: {valor}" for coluna, valor in filtros_sidebar if valor != 'Todos']
         try:
-            if genero_selecionado != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['b1_2_genero'] == genero_selecionado]
-                filtros_aplicados_texto.append(f"Gênero: {genero_selecionado}")
             if niveis_selecionados:
-                for nivel in niveis_selecionados:
-                    df_filtrado = df_filtrado[df_filtrado['b3_3_nivel_ensino'].str.contains(re.escape(nivel), na=False, case=False, regex=True)]
-                filtros_aplicados_texto.append(f"Nível(is): {', '.join(niveis_selecionados)}")
-            if faixa_etaria_selecionada != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Faixa_Etaria'] == faixa_etaria_selecionada]
-                filtros_aplicados_texto.append(f"Idade: {faixa_etaria_selecionada}")
-            if faixa_tempo_selecionada != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Faixa_Tempo_Profissao'] == faixa_tempo_selecionada]
-                filtros_aplicados_texto.append(f"Tempo Prof.: {faixa_tempo_selecionada}")
-            if faixa_carga_selecionada != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Faixa_Carga_Horaria'] == faixa_carga_selecionada]
-                filtros_aplicados_texto.append(f"Carga: {faixa_carga_selecionada}")
-            if violencia_selecionada != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Filtro_Violencia'] == violencia_selecionada]
-                filtros_aplicados_texto.append(f"Violência: {violencia_selecionada}")
-            if acompanhamento_selecionado != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Filtro_Acompanhamento'] == acompanhamento_selecionado]
-                filtros_aplicados_texto.append(f"Acompanhamento: {acompanhamento_selecionado}")
-            if instituicao_selecionada != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Filtro_Instituicao'] == instituicao_selecionada]
-                filtros_aplicados_texto.append(f"Instituição: {instituicao_selecionada}")
-            
-            # --- INÍCIO DA MUDANÇA (Aplicando novos filtros) ---
-            if autocuidado_selecionado != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Filtro_Autocuidado'] == autocuidado_selecionado]
-                filtros_aplicados_texto.append(f"Autocuidado: {autocuidado_selecionado}")
-            if lazer_selecionado != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Filtro_Lazer'] == lazer_selecionado]
-                filtros_aplicados_texto.append(f"Lazer: {lazer_selecionado}")
-            if apoio_gestao_selecionado != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Filtro_Apoio_Gestao'] == apoio_gestao_selecionado]
-                filtros_aplicados_texto.append(f"Apoio Gestão: {apoio_gestao_selecionado}")
-            if feedback_selecionado != 'Todos':
-                df_filtrado = df_filtrado[df_filtrado['Filtro_Feedback'] == feedback_selecionado]
-                filtros_aplicados_texto.append(f"Feedback: {feedback_selecionado}")
-            # --- FIM DA MUDANÇA ---
-                
+                filtros_aplicados_texto.insert(1 if genero_selecionado != 'Todos' else 0, f"{ROTULO_NIVEIS}: {', '.join(niveis_selecionados)}")
+            # Um único AND vetorizado de bitmasks e um único recorte do DataFrame
+            # (só a máscara: o DataFrame filtrado não precisa ser materializado)
+            with perfil.etapa("Aplicar filtros", linhas=len(df)):
+                mascara_filtro = modelo.mascara(selecoes, niveis=niveis_selecionados)
         except Exception as e_filter:
             st.error(f"Erro ao aplicar filtros: {e_filter}")
-            df_filtrado = pd.DataFrame() 
+            mascara_filtro = np.zeros(len(df), dtype=bool)
+        n_filtrado = int(np.count_nonzero(mascara_filtro))
+
+        grafico_no_navegador = st.sidebar.checkbox("Gráfico no navegador (Vega-Lite)", value=False)
+
+        # O painel de Mann-Whitney (medianas) só aparece com filtro e grupos não vazios
+        n_grupo_et = motor_et.tamanho_grupo(mascara_filtro) if motor_et is not None else 0
+        mostrar_mann_whitney = bool(filtros_aplicados_texto) and 0 < n_grupo_et < motor_et.n_validos
+
+        # IC 95% bootstrap do % de risco e das medianas (importante em grupos pequenos; medianas só com o painel acima)
+        intervalos_ic = {}
+        if st.sidebar.checkbox("Intervalos de confiança (bootstrap)", value=False) and n_filtrado > 0:
+            try:
+                with perfil.etapa("Bootstrap (IC)", linhas=n_filtrado):
+                    intervalos_ic = calcular_intervalos_bootstrap(versao, chave_mascara(mascara_filtro), mostrar_mann_whitney,
+                                                                  preparar_amostras_bootstrap(versao, df), mascara_filtro)
+            except Exception as e_ic:
+                st.sidebar.error(f"Erro no bootstrap: {e_ic}")
 
         # Exibir Resultados
         
         # 1. Cabeçalho (N e Filtros Aplicados)
-        st.subheader(f"Resultados (N = {len(df_filtrado)})")
+        st.subheader(f"Resultados (N = {n_filtrado})")
         if filtros_aplicados_texto:
             st.info(f"Filtros aplicados: {'; '.join(filtros_aplicados_texto)}")
         else:
@@ -270,19 +285,16 @@ if df is not None and not df.empty:
         st.markdown("---") # Linha divisória
 
         # 2. Visualização (APENAS SE O FILTRO NÃO ZEROU A AMOSTRA)
-        if not df_filtrado.empty:
+        if n_filtrado > 0:
             
             # --- VISUALIZAÇÃO 1: DISTRIBUIÇÃO BURNOUT (VEM PRIMEIRO) ---
-            if 'Nivel_Burnout' in df_filtrado.columns:
-                df_validos = df_filtrado[~df_filtrado['Nivel_Burnout'].isin(['Erro', 'Inválido', 'nan'])]
-                if not df_validos.empty:
+            if cubo is not None:
+                # Contagens dos Níveis 1-5 vêm do roll-up memorizado das dimensões selecionadas (sem value_counts no recorte)
+                with perfil.etapa("Contagens por nível", linhas=n_filtrado):
+                    count_n1, count_n2, count_n3, count_n4, count_n5 = (int(c) for c in cubo.distribuicao(selecoes, niveis_selecionados, mascara=mascara_filtro))
+                total_validos = count_n1 + count_n2 + count_n3 + count_n4 + count_n5
+                if total_validos > 0:
                     st.markdown("### Distribuição Burnout")
-                    contagem_niveis = df_validos['Nivel_Burnout'].value_counts()
-                    count_n1 = contagem_niveis.get('Nível 1', 0)
-                    count_n2 = contagem_niveis.get('Nível 2', 0)
-                    count_n3 = contagem_niveis.get('Nível 3', 0)
-                    count_n4 = contagem_niveis.get('Nível 4', 0)
-                    count_n5 = contagem_niveis.get('Nível 5', 0)
                     
                     st.markdown("##### Frequência (Nº de Professores) por Nível:")
                     st.markdown(f"""
@@ -296,14 +308,13 @@ if df is not None and not df.empty:
 
                     # Gráfico de Barras de Distribuição
                     try:
-                        fig, ax = plt.subplots(figsize=(10, 5)); cores = ['#4CAF50', '#FFEB3B', '#FF9800', '#F44336', '#B71C1C']
-                        ordem_niveis = ['Nível 1', 'Nível 2', 'Nível 3', 'Nível 4', 'Nível 5']
-                        contagem_ordenada = pd.Series([count_n1, count_n2, count_n3, count_n4, count_n5], index=ordem_niveis)
-                        bars = ax.bar(contagem_ordenada.index, contagem_ordenada.values, color=cores)
-                        ax.set_title(f"Distribuição (N={len(df_validos)})"); ax.set_xlabel("Nível Risco"); ax.set_ylabel("Contagem")
-                        total_validos = len(df_validos)
-                        custom_labels = [f"{count} ({((count/total_validos)*100):.1f}%)" if total_validos > 0 else f"{count} (0.0%)" for count in contagem_ordenada]
-                        ax.bar_label(bars, labels=custom_labels, label_type='edge', padding=3, fontsize=9); st.pyplot(fig)
+                        # Renderização memorizada pelas 5 contagens (LRU) ou Vega-Lite no navegador
+                        contagem_ordenada = (count_n1, count_n2, count_n3, count_n4, count_n5)
+                        with perfil.etapa("Gráfico", linhas=total_validos):
+                            if grafico_no_navegador:
+                                st.vega_lite_chart(especificacao_vega_distribuicao(contagem_ordenada))
+                            else:
+                                st.image(renderizar_distribuicao(contagem_ordenada))
                     except Exception as e_plot: st.error(f"Gráfico: {e_plot}")
                     
                     # Métrica
@@ -312,31 +323,29 @@ if df is not None and not df.empty:
                         total_validos_para_perc = total_validos if total_validos > 0 else 1
                         perc45 = (risco45 / total_validos_para_perc) * 100 if total_validos > 0 else 0
                         st.metric("Risco Alto/Crítico (Níveis 4/5)", f"{perc45:.1f}%", f"Total: {risco45}", delta_color="inverse")
+                        if intervalos_ic.get('perc45'):
+                            st.caption(f"IC 95% (bootstrap): {intervalos_ic['perc45'][0]:.1f}% a {intervalos_ic['perc45'][1]:.1f}%")
                     except Exception as e_metric: st.error(f"Métrica: {e_metric}")
                 else: st.warning("Sem dados válidos de Nível Burnout no grupo filtrado.")
-            else: st.error("Coluna 'Nivel_Burnout' não encontrada.")
+            else: st.error("Cubo de Nível Burnout indisponível.")
             
             st.markdown("---") # Linha divisória
 
             # --- VISUALIZAÇÃO 2: TESTE DE SIGNIFICÂNCIA DO FILTRO (VEM DEPOIS) ---
             if filtros_aplicados_texto: # Só roda se houver filtro
-                indices_filtrados = df_filtrado.index
-                df_restante = df.drop(indices_filtrados) 
-                
-                if not df_restante.empty and not df_filtrado.empty and 'ET' in df_filtrado.columns and 'ET' in df_restante.columns:
-                    mediana_grupo = df_filtrado['ET'].median()
-                    mediana_restante = df_restante['ET'].median()
-                    
+                # Postos de ET pré-calculados: U, p-valor e medianas saem da máscara (sem df.drop)
+                if mostrar_mann_whitney:
                     try:
                                 # 1. Cabeçalho (N e Filtros Aplicados)
-                        st.subheader(f"Resultados (N = {len(df_filtrado)})")
+                        st.subheader(f"Resultados (N = {n_filtrado})")
                         if filtros_aplicados_texto:
                             st.info(f"Filtros aplicados: {'; '.join(filtros_aplicados_texto)}")
                         else:
                             st.info("Mostrando resultados para todos os participantes (nenhum filtro aplicado).")
         
         
-                        stat, p_value = mannwhitneyu(df_filtrado['ET'].dropna(), df_restante['ET'].dropna(), alternative='two-sided')
+                        with perfil.etapa("Mann-Whitney", linhas=motor_et.n_validos):
+                            stat, p_value, mediana_grupo, mediana_restante, _, _ = motor_et.mann_whitney(mascara_filtro)
                         
                         st.markdown("##### Análise do Grupo Filtrado:")
                         
@@ -350,6 +359,9 @@ if df is not None and not df.empty:
                         col1.metric(label="Mediana (Grupo Filtrado)", value=f"{mediana_grupo:.2f}")
                         col2.metric(label="Mediana (Restante da Amostra)", value=f"{mediana_restante:.2f}")
                         col3.metric(label="P-valor (Mann-Whitney U)", value=p_text_metric)
+                        for coluna_ic, chave_ic in ((col1, 'mediana_grupo'), (col2, 'mediana_restante')):
+                            if intervalos_ic.get(chave_ic):
+                                coluna_ic.caption(f"IC 95% (bootstrap): {intervalos_ic[chave_ic][0]:.2f} a {intervalos_ic[chave_ic][1]:.2f}")
 
                         if p_value < 0.05:
                             p_text_display = f"(p = {p_text_metric})"
@@ -366,5 +378,85 @@ if df is not None and not df.empty:
             
         else: # Mensagem se o filtro zerou a amostra
             st.info("Nenhum professor corresponde aos filtros selecionados.")
+
+        # --- VISUALIZAÇÃO 3: COMPARAÇÃO ENTRE FAIXAS (KRUSKAL-WALLIS + DUNN) NO GRUPO FILTRADO ---
+        if st.sidebar.checkbox("Comparação entre faixas (Kruskal-Wallis)", value=False) and motor_et is not None and n_filtrado > 0:
+            st.markdown("---")
+            st.markdown("### Comparação entre Faixas (Kruskal-Wallis + Dunn)")
+            st.markdown("ET comparado entre todas as faixas de cada dimensão ordinal, dentro do grupo filtrado. Pares pelo teste de Dunn com correção de Holm ('Não Informado' excluído).")
+            try:
+                with perfil.etapa("Kruskal-Wallis + Dunn", linhas=n_filtrado):
+                    tabela_kruskal, tabela_dunn = calcular_comparacao_grupos(versao, chave_mascara(mascara_filtro), modelo, motor_et, mascara_filtro)
+                st.dataframe(tabela_kruskal, hide_index=True,
+                             column_config={'H': st.column_config.NumberColumn(format="%.2f"),
+                                            'P-valor': st.column_config.NumberColumn(format="%.4f")})
+                st.markdown("##### Comparações Par a Par (Dunn):")
+                st.dataframe(tabela_dunn, hide_index=True,
+                             column_config={'Z': st.column_config.NumberColumn(format="%.2f"),
+                                            'P-valor': st.column_config.NumberColumn(format="%.4f"),
+                                            'P-ajustado': st.column_config.NumberColumn(format="%.4f")})
+            except Exception as e_kruskal:
+                st.error(f"Erro na comparação entre faixas: {e_kruskal}")
+
+        # --- VISUALIZAÇÃO 4: CORRELAÇÕES ITENS (Q1-Q20) x CARGA/DEMANDA NO GRUPO FILTRADO ---
+        if st.sidebar.checkbox("Correlações (itens x carga de trabalho)", value=False) and n_filtrado > 0:
+            st.markdown("---")
+            st.markdown("### Correlações: Itens de Burnout x Carga e Demanda")
+            metodo_correlacao = st.radio("Método:", ['Spearman', 'Pearson'], horizontal=True)
+            try:
+                with perfil.etapa("Correlações", linhas=n_filtrado):
+                    variaveis_correlacao = preparar_variaveis_correlacao(versao, df)
+                    resultado_correlacao = calcular_correlacoes(versao, chave_mascara(mascara_filtro), variaveis_correlacao, mascara_filtro)[metodo_correlacao]
+                fig_corr, ax_corr = plt.subplots(figsize=(10, 9))
+                sns.heatmap(resultado_correlacao['r'], vmin=-1, vmax=1, center=0, cmap='RdBu_r', annot=True, fmt='.2f',
+                            annot_kws={'fontsize': 8}, cbar_kws={'label': f"r ({metodo_correlacao})"}, ax=ax_corr)
+                ax_corr.set_title(f"Correlação ({metodo_correlacao}, pares completos, N = {n_filtrado})")
+                st.pyplot(fig_corr); plt.close(fig_corr)
+                st.markdown("##### Pares ordenados pela força da correlação (IC 95%):")
+                st.dataframe(tabela_correlacoes(resultado_correlacao), hide_index=True,
+                             column_config={'r': st.column_config.NumberColumn(format="%.3f"),
+                                            'P-valor': st.column_config.NumberColumn(format="%.4f"),
+                                            'IC Inf': st.column_config.NumberColumn(format="%.3f"),
+                                            'IC Sup': st.column_config.NumberColumn(format="%.3f")})
+            except Exception as e_corr:
+                st.error(f"Erro nas correlações: {e_corr}")
+
+        # --- VISUALIZAÇÃO 5: VARREDURA DE SIGNIFICÂNCIA (TODAS AS OPÇÕES, SOB DEMANDA) ---
+        if st.sidebar.checkbox("Varredura de significância (todas as opções)", value=False) and motor_et is not None:
+            st.markdown("---")
+            st.markdown("### Varredura de Significância")
+            st.markdown("Cada opção de filtro comparada com o restante da amostra (Mann-Whitney U sobre ET), com correção de Benjamini-Hochberg para comparações múltiplas.")
+            try:
+                with perfil.etapa("Varredura de significância", linhas=motor_et.n_validos):
+                    tabela_varredura = calcular_varredura(versao, modelo, motor_et)
+                st.dataframe(tabela_varredura, hide_index=True,
+                             column_config={'P-valor': st.column_config.NumberColumn(format="%.4f"),
+                                            'P-ajustado': st.column_config.NumberColumn(format="%.4f"),
+                                            'Efeito (r)': st.column_config.NumberColumn(format="%.3f")})
+            except Exception as e_varredura:
+                st.error(f"Erro na varredura de significância: {e_varredura}")
 else:
     st.info("👈 Carregue o arquivo CSV LIMPO ('cleaned_data.csv') na barra lateral para iniciar.")
+
+# --- PERFIL DE DESEMPENHO: etapas desta execução + agregados p50/p95 do trace ---
+painel_perfil = st.sidebar.checkbox("Perfil de desempenho", value=False, key='perfil_ativo')
+registro_perfil = perfil.registro(versao=list(versao) if versao else None)
+erro_trace = None
+if ARQUIVO_PERFIL:
+    try:
+        gravar_trace(registro_perfil, ARQUIVO_PERFIL)
+    except OSError as e_trace:
+        erro_trace = e_trace
+if painel_perfil:
+    with st.expander(f"Perfil de desempenho (esta execução: {registro_perfil['total_ms']:.0f} ms)", expanded=True):
+        st.dataframe(perfil.tabela(), hide_index=True,
+                     column_config={'Tempo (ms)': st.column_config.NumberColumn(format="%.1f"),
+                                    'Pico Memória (MB)': st.column_config.NumberColumn(format="%.2f")})
+        if ARQUIVO_PERFIL and erro_trace is None:
+            st.markdown(f"##### Agregados das últimas execuções ('{ARQUIVO_PERFIL}'):")
+            st.dataframe(agregar_trace(ler_trace(ARQUIVO_PERFIL)), hide_index=True,
+                         column_config={'Tempo p50 (ms)': st.column_config.NumberColumn(format="%.1f"),
+                                        'Tempo p95 (ms)': st.column_config.NumberColumn(format="%.1f"),
+                                        'Pico Memória p95 (MB)': st.column_config.NumberColumn(format="%.2f")})
+        elif erro_trace is not None:
+            st.caption(f"Trace não gravado: {erro_trace}")
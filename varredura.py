@@ -0,0 +1,118 @@
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dados import carregar_dados
+from estatisticas import ajustar_p_valores, motor_da_coluna
+from modelo_filtros import ROTULO_NIVEIS, ROTULOS_DIMENSOES, preparar_base
+
+# Limite de células (grupos x respondentes) por bloco vetorizado e mínimo de opções para usar processos
+LIMITE_CELULAS_BLOCO = 1 << 24
+MIN_OPCOES_PARALELO = 64
+
+# Processos sem fork: a dashboard roda com várias threads, e fork de processo com threads pode travar
+METODO_INICIO = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+COLUNAS_VARREDURA = [
+    'Dimensão', 'Opção', 'N Grupo', 'N Restante', 'Mediana Grupo', 'Mediana Restante',
+    'Diferença Medianas', 'Efeito (r)', 'U', 'P-valor', 'P-ajustado', 'Significativo',
+]
+
+
+# --- Estado compartilhado pelos blocos (postos + códigos já na ordem crescente de ET) ---
+def _estado_varredura(modelo, motor):
+    codigos = {coluna: codigos[motor.ordem] for coluna, codigos in modelo.codigos.items()}
+    niveis = None
+    if modelo.matriz_niveis is not None:
+        niveis = modelo.matriz_niveis[motor.ordem].T.toarray()
+    return {'motor': motor, 'codigos': codigos, 'niveis': niveis}
+
+
+def _calcular_bloco(estado, bloco):
+    # bloco: lista de (coluna, posição da opção); coluna None = nível de ensino
+    dentro = np.vstack([
+        estado['niveis'][k] if coluna is None else estado['codigos'][coluna] == k
+        for coluna, k in bloco
+    ])
+    return estado['motor'].mann_whitney_lote(dentro)
+
+
+_ESTADO_PROCESSO = None
+
+
+def _iniciar_processo(estado):
+    global _ESTADO_PROCESSO
+    _ESTADO_PROCESSO = estado
+
+
+def _calcular_bloco_processo(bloco):
+    return _calcular_bloco(_ESTADO_PROCESSO, bloco)
+
+
+# --- Varredura: cada opção de cada dimensão (e cada nível de ensino) contra o restante ---
+def varredura_significancia(modelo, motor, metodo_correcao='fdr_bh', alfa=0.05, processos=None):
+    opcoes = [(coluna, k) for coluna in modelo.codigos for k in range(len(modelo.categorias[coluna]))]
+    opcoes += [(None, j) for j in range(len(modelo.niveis))]
+    rotulos = [
+        (ROTULO_NIVEIS, modelo.niveis[k]) if coluna is None else (ROTULOS_DIMENSOES.get(coluna, coluna), modelo.categorias[coluna][k])
+        for coluna, k in opcoes
+    ]
+    if not opcoes or motor.n_validos == 0:
+        return pd.DataFrame(columns=COLUNAS_VARREDURA)
+
+    tamanho_bloco = max(1, LIMITE_CELULAS_BLOCO // max(motor.n_validos, 1))
+    blocos = [opcoes[i:i + tamanho_bloco] for i in range(0, len(opcoes), tamanho_bloco)]
+    estado = _estado_varredura(modelo, motor)
+
+    if processos is None:
+        processos = min(os.cpu_count() or 1, len(blocos)) if len(opcoes) >= MIN_OPCOES_PARALELO else 1
+    if processos > 1 and len(blocos) > 1:
+        with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context(METODO_INICIO),
+                                 initializer=_iniciar_processo, initargs=(estado,)) as executor:
+            resultados = list(executor.map(_calcular_bloco_processo, blocos))
+    else:
+        resultados = [_calcular_bloco(estado, bloco) for bloco in blocos]
+
+    u1, p_valor, mediana_grupo, mediana_restante, n1, n2 = (np.concatenate(partes) for partes in zip(*resultados))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        efeito = 2 * u1 / (n1 * n2) - 1  # correlação rank-biserial (positivo: grupo com ET maior)
+    p_ajustado = ajustar_p_valores(p_valor, metodo_correcao)
+
+    tabela = pd.DataFrame({
+        'Dimensão': [dimensao for dimensao, _ in rotulos],
+        'Opção': [opcao for _, opcao in rotulos],
+        'N Grupo': n1,
+        'N Restante': n2,
+        'Mediana Grupo': mediana_grupo,
+        'Mediana Restante': mediana_restante,
+        'Diferença Medianas': mediana_grupo - mediana_restante,
+        'Efeito (r)': efeito,
+        'U': u1,
+        'P-valor': p_valor,
+        'P-ajustado': p_ajustado,
+        'Significativo': p_ajustado < alfa,
+    }, columns=COLUNAS_VARREDURA)
+    return tabela.sort_values('P-valor', na_position='last', kind='stable').reset_index(drop=True)
+
+
+# --- Execução agendada (ex.: noturna): grava a tabela em CSV ---
+# Ex.: python varredura.py --saida varredura_significancia.csv
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Varredura de significância (Mann-Whitney de cada opção contra o restante).")
+    parser.add_argument('--arquivo', default='cleaned_data.csv')
+    parser.add_argument('--saida', default='varredura_significancia.csv')
+    parser.add_argument('--correcao', default='fdr_bh', choices=['fdr_bh', 'holm'])
+    parser.add_argument('--processos', type=int, default=None)
+    args = parser.parse_args()
+
+    df, modelo = preparar_base(carregar_dados(args.arquivo))
+    if modelo is None:
+        raise SystemExit(f"'{args.arquivo}' não tem as colunas necessárias para os filtros.")
+    motor = motor_da_coluna(df['ET'])
+    tabela = varredura_significancia(modelo, motor, metodo_correcao=args.correcao, processos=args.processos)
+    tabela.to_csv(args.saida, sep=';', index=False, encoding='utf-8-sig')
+    print(f"{len(tabela)} opções testadas; {int(tabela['Significativo'].sum())} significativas após correção -> {args.saida}")